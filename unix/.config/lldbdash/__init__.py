@@ -46,6 +46,10 @@ def register_dashboard(debugger: lldb.SBDebugger):
         f"command script add --class lldbdash.dashboard.PrintCommand {container} print",
     )
 
+    debugger.HandleCommand(
+        f"command script add --class lldbdash.dashboard.StatsCommand {container} stats",
+    )
+
     debugger.HandleCommand(
         f"command script add --class lldbdash.dashboard.DumpCommand {container} dump",
     )
@@ -86,6 +90,22 @@ def register_modules(debugger: lldb.SBDebugger):
 
         debugger.HandleCommand(f"command script add --class {print_command.handlers[0]} {container} print")
 
+        register_commands(module.commands, debugger, container)
+
+
+def register_commands(commands: lldbdash.common.Commands, debugger: lldb.SBDebugger, container: str):
+    containers = set[str]()
+
+    for name, command in commands.items():
+        *parents, _ = name.split()
+        for i in range(len(parents)):
+            parent = " ".join(parents[: i + 1])
+            if parent not in containers:
+                containers.add(parent)
+                debugger.HandleCommand(f"command container add {container} {parent}")
+
+        debugger.HandleCommand(f"command script add --class {command.handlers[0]} {container} {name}")
+
 
 def register_settings(
     settings: lldbdash.common.Settings,
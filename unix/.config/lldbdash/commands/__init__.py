@@ -1,4 +1,5 @@
 from .bool_command import BoolCommand as BoolCommand
+from .callback_command import CallbackCommand as CallbackCommand
 from .command import Command as Command
 from .int_command import IntCommand as IntCommand
 from .list_settings_command import ListSettingsCommand as ListSettingsCommand
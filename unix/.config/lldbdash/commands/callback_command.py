@@ -0,0 +1,37 @@
+import shlex
+import typing
+
+import lldb
+
+from .pure_command import PureCommand
+
+Callback = typing.Callable[[list[str], lldb.SBCommandReturnObject], None]
+
+
+class CallbackCommand(PureCommand):
+    def __init__(
+        self,
+        callback: Callback,
+        help: typing.Optional[str] = None,
+        long_help: typing.Optional[str] = None,
+    ):
+        class Handle:
+            def __init__(self, debugger: lldb.SBDebugger, internal_dict: dict):
+                pass
+
+            def __call__(
+                _self,
+                _debugger: lldb.SBDebugger,
+                _command: str,
+                _exe_ctx: lldb.SBExecutionContext,
+                _result: lldb.SBCommandReturnObject,
+            ):
+                callback(shlex.split(_command), _result)
+
+            def get_short_help(self):
+                return help
+
+            def get_long_help(self):
+                return long_help
+
+        super().__init__(Handle)
@@ -13,6 +13,8 @@ def default_on_change(prev_value: T, value: T):
 
 
 class Command(HandlerContainer, typing.Generic[T]):
+    epoch: typing.ClassVar[int] = 0
+
     def __init__(
         self,
         initial_value: T,
@@ -30,6 +32,7 @@ class Command(HandlerContainer, typing.Generic[T]):
     def set_value(self, value: T):
         self.on_change(self.value, value)
         self.value = value
+        Command.epoch += 1
 
     def __str__(self):
         return str(self.value)
@@ -34,7 +34,10 @@ class StrCommand(Command[str]):
                     _result.SetError(f"Command expects exactly one argument but {len(args)} were given.")
                     return
 
-                self.set_value(args[0])
+                try:
+                    self.set_value(args[0])
+                except ValueError as e:
+                    _result.SetError(str(e))
 
             def get_short_help(self):
                 return help
@@ -2,7 +2,17 @@ from .batched import batched as batched
 from .constants import FONT_BOLD as FONT_BOLD
 from .constants import FONT_UNDERLINE as FONT_UNDERLINE
 from .constants import RESET_COLOR as RESET_COLOR
+from .frame_writer import FrameWriter as FrameWriter
+from .globals import FileStreamsEntry as FileStreamsEntry
 from .globals import g_file_streams as g_file_streams
+from .render_buffer import RenderBuffer as RenderBuffer
+from .render_stats import RenderStats as RenderStats
+from .render_stats import g_render_stats as g_render_stats
+from .screen import Screen as Screen
+from .sgr import is_terminal as is_terminal
+from .sgr import minimize_sgr as minimize_sgr
+from .sgr import strip_sgr as strip_sgr
 from .type_guards import not_none as not_none
+from .types import Commands as Commands
 from .types import Output as Output
 from .types import Settings as Settings
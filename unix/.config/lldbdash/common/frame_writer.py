@@ -0,0 +1,61 @@
+import collections
+import threading
+import typing
+
+
+class FrameWriter:
+    def __init__(
+        self,
+        name: str,
+        write: typing.Callable[[str], None],
+        on_close: typing.Callable[[], None],
+        on_drop: typing.Callable[[], None],
+        capacity: int = 1,
+    ):
+        self.write = write
+        self.on_close = on_close
+        self.on_drop = on_drop
+        self.frames = collections.deque[str](maxlen=capacity)
+        self.condition = threading.Condition()
+        self.closed = False
+        self.finished = False
+        self.thread = threading.Thread(target=self.run, name=f"lldbdash writer {name}", daemon=True)
+        self.thread.start()
+
+    def put(self, frame: str):
+        # A consumer that falls behind only ever gets the newest frames
+        with self.condition:
+            if len(self.frames) == self.frames.maxlen:
+                self.on_drop()
+            self.frames.append(frame)
+            self.condition.notify()
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.frames.clear()
+            self.condition.notify()
+
+    def reopen(self):
+        # A writer that has not seen the close yet keeps serving, one that has needs a successor
+        with self.condition:
+            if self.finished:
+                return False
+            self.closed = False
+            return True
+
+    def run(self):
+        try:
+            while True:
+                with self.condition:
+                    while not self.frames and not self.closed:
+                        self.condition.wait()
+                    if self.closed:
+                        break
+                    frame = self.frames.popleft()
+                self.write(frame)
+        finally:
+            # A writer that failed can not be reopened either, its output gets a new one when selected again
+            with self.condition:
+                self.finished = True
+            self.on_close()
@@ -2,5 +2,10 @@ import typing
 
 import lldb
 
-FileStreamsEntry = typing.TypedDict("FileStreamsEntry", {"stream": lldb.SBStream, "num_writers": int})
+from .frame_writer import FrameWriter
+from .screen import Screen
+
+FileStreamsEntry = typing.TypedDict(
+    "FileStreamsEntry", {"stream": lldb.SBStream, "num_writers": int, "screen": Screen, "writer": FrameWriter}
+)
 g_file_streams: dict[str, FileStreamsEntry] = dict()
@@ -0,0 +1,12 @@
+class RenderBuffer:
+    def __init__(self):
+        self.parts: list[str] = []
+
+    def write(self, text: str):
+        self.parts.append(text)
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+    def clear(self):
+        self.parts.clear()
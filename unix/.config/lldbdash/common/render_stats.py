@@ -0,0 +1,72 @@
+import threading
+
+
+class RenderStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self.renders = 0
+        self.writes = 0
+        self.bytes = 0
+        self.last_writes = 0
+        self.last_bytes = 0
+        self.saved = 0
+        self.last_saved = 0
+        self.dropped = 0
+        self.render_time = 0.0
+        self.last_render_time = 0.0
+        self.module_bytes = dict[str, int]()
+
+    def begin(self):
+        with self.lock:
+            self.renders += 1
+            self.last_writes = self.last_bytes = self.last_saved = 0
+            self.module_bytes.clear()
+
+    def add_render_time(self, seconds: float):
+        with self.lock:
+            self.render_time += seconds
+            self.last_render_time = seconds
+
+    def add_module(self, name: str, size: int):
+        with self.lock:
+            self.module_bytes[name] = size
+
+    # Redirected outputs are written from their writer threads
+    def add_write(self, size: int, saved: int = 0):
+        with self.lock:
+            self.writes += 1
+            self.bytes += size
+            self.saved += saved
+            self.last_writes += 1
+            self.last_bytes += size
+            self.last_saved += saved
+
+    def add_drop(self):
+        with self.lock:
+            self.dropped += 1
+
+    def reset(self):
+        with self.lock:
+            self.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "renders": self.renders,
+                "writes": self.writes,
+                "bytes": self.bytes,
+                "last writes": self.last_writes,
+                "last bytes": self.last_bytes,
+                "escape bytes saved": self.saved,
+                "last escape bytes saved": self.last_saved,
+                "dropped frames": self.dropped,
+                "render ms": round(self.render_time * 1000, 3),
+                "last render ms": round(self.last_render_time * 1000, 3),
+                **{f"last {name} bytes": size for name, size in self.module_bytes.items()},
+            }
+
+
+g_render_stats = RenderStats()
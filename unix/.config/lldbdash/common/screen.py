@@ -0,0 +1,62 @@
+import os
+import typing
+
+from .sgr import strip_sgr
+
+CLEAR_SCREEN = "\033[H\033[2J"
+CLEAR_LINE = "\033[K"
+
+
+class Screen:
+    def __init__(self, path: str):
+        self.path = path
+        self.lines: list[str] = []
+        self.size: typing.Optional[os.terminal_size] = None
+        self.fd: typing.Optional[int] = None
+
+    def terminal_size(self):
+        try:
+            if self.fd is None:
+                self.fd = os.open(self.path, os.O_RDONLY | os.O_NOCTTY | os.O_NONBLOCK)
+            return os.get_terminal_size(self.fd)
+        except OSError:
+            return None
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def reset(self):
+        self.lines = []
+
+    def diff(self, frame: str):
+        size = self.terminal_size()
+        if size is None:
+            self.lines = []
+            return frame
+
+        lines = frame.split("\n")
+        prev_lines = self.lines
+        prev_size = self.size
+        self.lines = lines
+        self.size = size
+
+        # Wrapped or scrolled lines no longer sit on the row of their index, so those frames are drawn in full
+        if (
+            size != prev_size
+            or not prev_lines
+            or len(lines) > size.lines
+            or any(len(strip_sgr(line)) > size.columns for line in lines)
+        ):
+            self.lines = [] if len(lines) > size.lines else lines
+            return CLEAR_SCREEN + frame
+
+        parts: list[str] = []
+        for i, line in enumerate(lines):
+            if i >= len(prev_lines) or line != prev_lines[i]:
+                parts.append(f"\033[{i + 1}H{line}{CLEAR_LINE}")
+        for i in range(len(lines), len(prev_lines)):
+            parts.append(f"\033[{i + 1}H{CLEAR_LINE}")
+        parts.append(f"\033[{len(lines)}H")
+        return "".join(parts)
@@ -0,0 +1,119 @@
+import os
+import re
+import stat
+import sys
+import typing
+
+from .constants import RESET_COLOR
+
+SGR_PATTERN = re.compile(r"\033\[([0-9;]*)m")
+
+# Codes that switch an attribute back to its default, keyed to the attribute they reset
+DEFAULT_CODES = {
+    22: "intensity",
+    23: "italic",
+    24: "underline",
+    25: "blink",
+    27: "inverse",
+    28: "hidden",
+    29: "strike",
+    39: "foreground",
+    49: "background",
+    59: "underline-color",
+}
+ATTRIBUTE_CODES = {
+    1: "intensity",
+    2: "intensity",
+    3: "italic",
+    4: "underline",
+    21: "underline",
+    5: "blink",
+    6: "blink",
+    7: "inverse",
+    8: "hidden",
+    9: "strike",
+    38: "foreground",
+    48: "background",
+    58: "underline-color",
+    **{code: "foreground" for code in (*range(30, 38), *range(90, 98))},
+    **{code: "background" for code in (*range(40, 48), *range(100, 108))},
+}
+
+# Whitespace looks the same whatever these are set to
+WHITESPACE_INVISIBLE = {"foreground", "intensity", "italic", "blink"}
+
+SgrState = dict[typing.Union[str, int], str]
+
+
+def sgr_attributes(params: str):
+    codes = params.split(";")
+    i = 0
+    while i < len(codes):
+        code = int(codes[i] or 0)
+        # Extended colors carry their arguments as 5;n or 2;r;g;b
+        n = (3 if codes[i + 1 : i + 2] == ["5"] else 5) if code in (38, 48, 58) else 1
+        yield code, ";".join(codes[i : i + n])
+        i += n
+
+
+def sgr_transition(emitted: SgrState, pending: SgrState):
+    if all(pending.get(key) == param for key, param in emitted.items()):
+        return f"\033[{';'.join(param for key, param in pending.items() if emitted.get(key) != param)}m"
+    if not pending:
+        return RESET_COLOR
+    return f"\033[0;{';'.join(pending.values())}m"
+
+
+def minimize_sgr(text: str):
+    parts: list[str] = []
+    emitted = SgrState()
+    pending = SgrState()
+
+    def emit(segment: str):
+        nonlocal emitted
+        if pending != emitted and not (segment.isspace() and same_on_whitespace(emitted, pending)):
+            parts.append(sgr_transition(emitted, pending))
+            emitted = dict(pending)
+        parts.append(segment)
+
+    # Escapes only take effect once visible text follows them, until then they are folded into the pending state
+    pos = 0
+    for match in SGR_PATTERN.finditer(text):
+        if match.start() > pos:
+            emit(text[pos : match.start()])
+        pos = match.end()
+
+        for code, param in sgr_attributes(match.group(1)):
+            if code == 0:
+                pending.clear()
+            elif code in DEFAULT_CODES:
+                pending.pop(DEFAULT_CODES[code], None)
+            else:
+                key = ATTRIBUTE_CODES.get(code, code)
+                pending.pop(key, None)
+                pending[key] = param
+
+    if pos < len(text):
+        emit(text[pos:])
+    if emitted:
+        parts.append(RESET_COLOR)
+    return "".join(parts)
+
+
+def same_on_whitespace(a: SgrState, b: SgrState):
+    return all(b.get(key) == param for key, param in a.items() if key not in WHITESPACE_INVISIBLE) and all(
+        key in a or key in WHITESPACE_INVISIBLE for key in b
+    )
+
+
+def strip_sgr(text: str):
+    return SGR_PATTERN.sub("", text)
+
+
+def is_terminal(output: str):
+    try:
+        if output == "0":
+            return os.isatty(sys.__stdout__.fileno())
+        return stat.S_ISCHR(os.stat(output).st_mode)
+    except (AttributeError, OSError, ValueError):
+        return False
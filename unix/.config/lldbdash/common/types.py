@@ -1,7 +1,12 @@
 import lldb
 
 from lldbdash.commands import Command
+from lldbdash.commands.pure_command import PureCommand
+
+from .render_buffer import RenderBuffer
 
 Settings = dict[str, Command]
 
-Output = lldb.SBStream | lldb.SBCommandReturnObject
+Commands = dict[str, PureCommand]
+
+Output = lldb.SBStream | lldb.SBCommandReturnObject | RenderBuffer
@@ -1,6 +1,8 @@
 from .dashboard import Dashboard as Dashboard
 from .dashboard import is_running as is_running
 from .dashboard import terminal_window_size as terminal_window_size
+from .dashboard import write_frame as write_frame
 from .dump_command import DumpCommand as DumpCommand
 from .load_command import LoadCommand as LoadCommand
 from .print_command import PrintCommand as PrintCommand
+from .stats_command import StatsCommand as StatsCommand
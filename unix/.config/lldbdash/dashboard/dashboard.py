@@ -1,11 +1,24 @@
+import concurrent.futures
 import pathlib
 import shutil
+import time
 import typing
 
 import lldb
 
 import lldbdash.commands
-from lldbdash.common import RESET_COLOR, Output, Settings, g_file_streams
+from lldbdash.common import (
+    RESET_COLOR,
+    Output,
+    RenderBuffer,
+    Screen,
+    Settings,
+    g_file_streams,
+    g_render_stats,
+    is_terminal,
+    minimize_sgr,
+    strip_sgr,
+)
 
 from .apply_config import apply_config
 
@@ -22,6 +35,9 @@ if typing.TYPE_CHECKING:
             "text-secondary": lldbdash.commands.StrCommand,
             "divider-fill-char": lldbdash.commands.StrCommand,
             "show-divider": lldbdash.commands.BoolCommand,
+            "colors": lldbdash.commands.StrCommand,
+            "fixed-screen": lldbdash.commands.BoolCommand,
+            "parallel-render": lldbdash.commands.BoolCommand,
             "auto-apply-config": lldbdash.commands.BoolCommand,
             "output": lldbdash.commands.StrCommand,
         },
@@ -33,6 +49,11 @@ def on_change_output(prev_output: str, output: str):
         module.settings["output"].set_value(output)
 
 
+def on_change_fixed_screen(prev_value: bool, value: bool):
+    for entry in list(g_file_streams.values()):
+        entry["screen"].reset()
+
+
 def is_running(exe_ctx: lldb.SBExecutionContext):
     state: int = exe_ctx.GetProcess().GetState()
     return Dashboard.instance and state in (lldb.eStateStopped, lldb.eStateCrashed)
@@ -51,6 +72,17 @@ class Dashboard:
         "text-secondary": lldbdash.commands.StrCommand("\033[38;2;114;114;110m"),
         "divider-fill-char": lldbdash.commands.StrCommand("─"),
         "show-divider": lldbdash.commands.BoolCommand(True),
+        "colors": lldbdash.commands.StrCommand(
+            "auto", help="Whether to emit colors: on, off or auto to emit them only to terminals."
+        ),
+        "fixed-screen": lldbdash.commands.BoolCommand(
+            False,
+            help="Keep the outputs that are other terminals in place and redraw only their changed lines.",
+            on_change=on_change_fixed_screen,
+        ),
+        "parallel-render": lldbdash.commands.BoolCommand(
+            False, help="Render the enabled modules concurrently, their output keeps the configured order."
+        ),
         "auto-apply-config": lldbdash.commands.BoolCommand(
             True, help="Auto apply config changes when edited during debug session."
         ),
@@ -61,6 +93,7 @@ class Dashboard:
         ),
     }
     enabled: typing.ClassVar[lldbdash.commands.ToggleCommand]
+    render_count: typing.ClassVar[int] = 0
 
     def __init__(self, target: lldb.SBTarget, extra_args: lldb.SBStructuredData, dict: dict):
         self.config_modified_time = 0
@@ -79,15 +112,36 @@ class Dashboard:
     def print_modules(self, exe_ctx: lldb.SBExecutionContext, out: Output):
         show_divider = Dashboard.settings["show-divider"].value
         size = terminal_window_size()
-        for module in Dashboard.modules:
-            if not module.enabled:
-                continue
-            module_output = module.settings["output"].value
-            if module_output != "0":
-                out = g_file_streams[module_output]["stream"]
+        Dashboard.render_count += 1
+        g_render_stats.begin()
+
+        def render(module: "Module"):
+            # Modules render into a Python side buffer, every output receives a single write per stop
+            buffer = RenderBuffer()
             if show_divider:
-                print_divider(size, module, out)
-            module.render(size, exe_ctx, out)
+                print_divider(size, module, buffer)
+            module.render(size, exe_ctx, buffer)
+            return buffer.getvalue()
+
+        modules = [module for module in Dashboard.modules if module.enabled]
+        start = time.perf_counter()
+        if Dashboard.settings["parallel-render"].value and len(modules) > 1:
+            texts = list(get_render_pool().map(render, modules))
+        else:
+            texts = [render(module) for module in modules]
+        g_render_stats.add_render_time(time.perf_counter() - start)
+
+        frames = dict[str, list[str]]()
+        for module, text in zip(modules, texts):
+            g_render_stats.add_module(module.name, len(text.encode()))
+            frames.setdefault(module.settings["output"].value, []).append(text)
+
+        # Redirected outputs are written by their own threads so a blocked terminal never stalls the stop
+        for module_output, parts in frames.items():
+            if module_output == "0":
+                write_frame(out, "".join(parts))
+            else:
+                g_file_streams[module_output]["writer"].put("".join(parts))
 
     def apply_config(self):
         path = pathlib.Path.cwd() / Dashboard.settings["config-file"].value
@@ -102,6 +156,30 @@ class Dashboard:
         return typing.cast(Settings, cls.settings)
 
 
+g_render_pool: typing.Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def get_render_pool():
+    global g_render_pool
+    if g_render_pool is None:
+        g_render_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="lldbdash render")
+    return g_render_pool
+
+
+def write_frame(out: Output, text: str, output: str = "0", screen: typing.Optional[Screen] = None):
+    if screen is not None and Dashboard.settings["fixed-screen"].value:
+        text = screen.diff(text)
+    colors = Dashboard.settings["colors"].value
+    if colors == "off" or colors != "on" and not is_terminal(output):
+        frame = strip_sgr(text)
+    else:
+        frame = minimize_sgr(text)
+    if frame:
+        out.write(frame)
+        # Escapes are ASCII, so the characters removed are the bytes saved
+        g_render_stats.add_write(len(frame.encode()), len(text) - len(frame))
+
+
 def print_divider(size: "terminal_size", module: "Module", out: Output):
     fill_char = Dashboard.settings["divider-fill-char"].value
 
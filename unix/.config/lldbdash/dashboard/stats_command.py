@@ -0,0 +1,27 @@
+import lldb
+
+from lldbdash.common import g_render_stats
+
+
+class StatsCommand:
+    def __init__(self, debugger: lldb.SBDebugger, internal_dict: dict):
+        pass
+
+    def __call__(
+        self,
+        debugger: lldb.SBDebugger,
+        command: str,
+        exe_ctx: lldb.SBExecutionContext,
+        result: lldb.SBCommandReturnObject,
+    ):
+        if command.strip() == "reset":
+            g_render_stats.reset()
+            return
+        for name, value in g_render_stats.stats().items():
+            result.Print(f"{name}: {value}\n")
+
+    def get_short_help(self):
+        return "Print the render statistics of the dashboard, or reset them with 'reset'."
+
+    def get_long_help(self):
+        return None
@@ -0,0 +1,104 @@
+import typing
+
+from .branch_condition import Condition
+
+# AArch64 condition codes in their encoding order, odd codes are the negation of the preceding even code
+CC_EQ, CC_NE, CC_CS, CC_CC, CC_MI, CC_PL, CC_VS, CC_VC, CC_HI, CC_LS, CC_GE, CC_LT, CC_GT, CC_LE, CC_AL, CC_NV = range(
+    16
+)
+# Conditions on a register operand
+CC_ZERO, CC_NONZERO, CC_BIT_CLEAR, CC_BIT_SET = range(16, 20)
+
+CONDITION_SUFFIXES = {
+    "eq": CC_EQ,
+    "ne": CC_NE,
+    "cs": CC_CS,
+    "hs": CC_CS,
+    "cc": CC_CC,
+    "lo": CC_CC,
+    "mi": CC_MI,
+    "pl": CC_PL,
+    "vs": CC_VS,
+    "vc": CC_VC,
+    "hi": CC_HI,
+    "ls": CC_LS,
+    "ge": CC_GE,
+    "lt": CC_LT,
+    "gt": CC_GT,
+    "le": CC_LE,
+    "al": CC_AL,
+    "nv": CC_NV,
+}
+
+# Instructions whose last operand is a condition
+CONDITIONAL_SELECTS = {
+    "csel",
+    "csinc",
+    "csinv",
+    "csneg",
+    "cset",
+    "csetm",
+    "cinc",
+    "cinv",
+    "cneg",
+    "fcsel",
+    "ccmp",
+    "ccmn",
+    "fccmp",
+    "fccmpe",
+}
+
+REGISTER_TESTS = {
+    "cbz": CC_ZERO,
+    "cbnz": CC_NONZERO,
+    "tbz": CC_BIT_CLEAR,
+    "tbnz": CC_BIT_SET,
+}
+
+
+def resolve_condition(mnemonic: str, operands: str) -> typing.Optional[Condition]:
+    mnemonic = mnemonic.lower()
+    prefix, dot, suffix = mnemonic.partition(".")
+    if dot and prefix in ("b", "bc"):
+        code = CONDITION_SUFFIXES.get(suffix)
+        return Condition(code) if code is not None else None
+
+    args = [arg.strip() for arg in operands.lower().split(",")]
+    if mnemonic in CONDITIONAL_SELECTS:
+        code = CONDITION_SUFFIXES.get(args[-1])
+        return Condition(code) if code is not None else None
+
+    code = REGISTER_TESTS.get(mnemonic)
+    if code is None or not args[0]:
+        return None
+    if code in (CC_BIT_CLEAR, CC_BIT_SET):
+        try:
+            return Condition(code, args[0], int(args[1].lstrip("#"), 0))
+        except (IndexError, ValueError):
+            return None
+    return Condition(code, args[0])
+
+
+def condition_mask(cpsr: int) -> int:
+    n = (cpsr >> 31) & 1
+    z = (cpsr >> 30) & 1
+    c = (cpsr >> 29) & 1
+    v = (cpsr >> 28) & 1
+    ge = 1 ^ n ^ v
+
+    mask = z | c << CC_CS | n << CC_MI | v << CC_VS | (c & ~z & 1) << CC_HI | ge << CC_GE | (ge & ~z & 1) << CC_GT
+    mask |= ((mask ^ 0x1555) & 0x1555) << 1
+    # Both AL and NV mean always on AArch64
+    mask |= 1 << CC_AL | 1 << CC_NV
+
+    return mask
+
+
+def test_register(condition: Condition, value: int) -> bool:
+    if condition.code == CC_ZERO:
+        return value == 0
+    if condition.code == CC_NONZERO:
+        return value != 0
+    if condition.code == CC_BIT_CLEAR:
+        return not value >> condition.bit & 1
+    return bool(value >> condition.bit & 1)
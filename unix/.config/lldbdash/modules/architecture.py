@@ -0,0 +1,120 @@
+import dataclasses
+import typing
+
+from . import aarch64_condition_codes, condition_codes
+from .branch_condition import Condition
+
+if typing.TYPE_CHECKING:
+    from .register_reader import RegisterReader
+
+# Register name prefix and the bit range its change highlight covers, keyed by 128-bit chunk index
+VectorLabels = dict[int, tuple[str, int, typing.Optional[int]]]
+
+
+@dataclasses.dataclass(frozen=True)
+class Architecture:
+    name: str
+    max_instruction_size: int
+    instruction_alignment: int
+    gp_registers: tuple[tuple[str, ...], ...]
+    gp_widths: tuple[int, ...]
+    segment_registers: tuple[str, ...]
+    flags_register: str
+    control_registers: tuple[str, ...]
+    fpu_registers: tuple[str, ...]
+    x87_prefix: typing.Optional[str]
+    vector_families: tuple[str, ...]
+    vector_labels: VectorLabels
+    opmask_prefix: typing.Optional[str]
+    resolve_condition: typing.Callable[[str, str], typing.Optional[Condition]]
+    condition_mask: typing.Callable[["RegisterReader"], int]
+    test_register: typing.Callable[[Condition, int], bool]
+
+
+def x86_64_condition_mask(reader: "RegisterReader"):
+    return condition_codes.condition_mask(reader.read_value("rflags"), reader.read_value("rcx"))
+
+
+def aarch64_condition_mask(reader: "RegisterReader"):
+    return aarch64_condition_codes.condition_mask(reader.read_value("cpsr"))
+
+
+X86_64 = Architecture(
+    name="x86_64",
+    max_instruction_size=15,
+    instruction_alignment=1,
+    gp_registers=(
+        ("rax", "eax", "ax", "al"),
+        ("rbx", "ebx", "bx", "bl"),
+        ("rcx", "ecx", "cx", "cl"),
+        ("rdx", "edx", "dx", "dl"),
+        ("rdi", "edi", "di", "dil"),
+        ("rsi", "esi", "si", "sil"),
+        ("rbp", "ebp", "bp", "bpl"),
+        ("rsp", "esp", "sp", "spl"),
+        ("r8", "r8d", "r8w", "r8l"),
+        ("r9", "r9d", "r9w", "r9l"),
+        ("r10", "r10d", "r10w", "r10l"),
+        ("r11", "r11d", "r11w", "r11l"),
+        ("r12", "r12d", "r12w", "r12l"),
+        ("r13", "r13d", "r13w", "r13l"),
+        ("r14", "r14d", "r14w", "r14l"),
+        ("r15", "r15d", "r15w", "r15l"),
+    ),
+    gp_widths=(64, 32, 16, 8),
+    segment_registers=("cs", "ss", "ds", "es", "fs", "gs"),
+    flags_register="rflags",
+    control_registers=("mxcsr",),
+    fpu_registers=("fctrl", "fstat", "ftag"),
+    x87_prefix="st",
+    vector_families=("zmm", "ymm", "xmm"),
+    vector_labels={0: ("xmm", 0, 128), 1: ("ymm", 128, 256), 3: ("zmm", 256, 512)},
+    opmask_prefix="k",
+    resolve_condition=condition_codes.resolve_condition,
+    condition_mask=x86_64_condition_mask,
+    test_register=lambda condition, value: False,
+)
+
+AARCH64 = Architecture(
+    name="aarch64",
+    max_instruction_size=4,
+    instruction_alignment=4,
+    gp_registers=tuple((f"x{i}", f"w{i}") for i in range(29)) + (("fp", "w29"), ("lr", "w30"), ("sp", "wsp"), ("pc",)),
+    gp_widths=(64, 32),
+    segment_registers=(),
+    flags_register="cpsr",
+    control_registers=("fpsr", "fpcr"),
+    fpu_registers=(),
+    x87_prefix=None,
+    vector_families=("z", "v"),
+    vector_labels={0: ("v", 0, 128), 1: ("z", 128, None)},
+    opmask_prefix="p",
+    resolve_condition=aarch64_condition_codes.resolve_condition,
+    condition_mask=aarch64_condition_mask,
+    test_register=aarch64_condition_codes.test_register,
+)
+
+ARCHITECTURES = {
+    "x86_64": X86_64,
+    "x86_64h": X86_64,
+    "aarch64": AARCH64,
+    "arm64": AARCH64,
+    "arm64e": AARCH64,
+    "arm64_32": AARCH64,
+}
+
+
+def select_architecture(triple: typing.Optional[str]):
+    return ARCHITECTURES.get((triple or "").split("-", 1)[0], X86_64)
+
+
+class BranchPredictor:
+    def __init__(self, arch: Architecture, reader: "RegisterReader"):
+        self.arch = arch
+        self.reader = reader
+        self.mask = arch.condition_mask(reader)
+
+    def is_taken(self, condition: Condition) -> bool:
+        if condition.register is None:
+            return bool(self.mask >> condition.code & 1)
+        return self.arch.test_register(condition, self.reader.read_value(condition.register))
@@ -1,4 +1,7 @@
+import array
+import bisect
 import dataclasses
+import functools
 import os
 import typing
 
@@ -6,17 +9,21 @@ import lldb
 import lldb.utils
 
 import lldbdash.commands
-from lldbdash.common import FONT_UNDERLINE, RESET_COLOR, Output
+from lldbdash.common import FONT_UNDERLINE, RESET_COLOR, Commands, Output
 from lldbdash.dashboard import Dashboard
 
-from .branch_map import BRANCH_MAP
+from .architecture import Architecture, BranchPredictor, select_architecture
+from .backward_disassembler import disassemble_backward, region_start
+from .branch_condition import Condition
+from .disassembly_cache import g_backward_cache, g_disassembly_cache, region_cache_key, symbol_cache_key
+from .disk_cache import g_disk_cache
 from .on_change_output import on_change_output
-from .register import RflagsRegister
 from .register_reader import RegisterReader
+from .symbol_index import g_symbol_indexes
 
 
 class Instruction:
-    @dataclasses.dataclass
+    @dataclasses.dataclass(frozen=True)
     class PrintDimensions:
         name_width: int
         opcode_width: int
@@ -26,138 +33,384 @@ class Instruction:
         self,
         target: lldb.SBTarget,
         symbol: lldb.SBSymbol,
-        instruction: lldb.SBInstruction,
+        addr: int,
+        size: int,
+        code: memoryview,
     ):
         self.symbol: lldb.SBSymbol = symbol
+        self.target = target
+        self.addr = addr
+        self.size = size
+        self.code = code
+
+        self.row_key: typing.Optional[tuple[int, Instruction.PrintDimensions]] = None
+        self.condition_arch: typing.Optional[Architecture] = None
+        self.condition: typing.Optional[Condition] = None
+
+    @classmethod
+    def decode(
+        cls,
+        target: lldb.SBTarget,
+        symbol: lldb.SBSymbol,
+        instruction: lldb.SBInstruction,
+        code: memoryview,
+        code_addr: int,
+    ):
+        addr: int = instruction.GetAddress().GetLoadAddress(target)
+        size: int = instruction.GetByteSize()
+        self = cls(target, symbol, addr, size, code[addr - code_addr : addr - code_addr + size])
+        self.instruction = instruction
+        return self
+
+    @classmethod
+    def block(cls, symbol: lldb.SBSymbol, target: lldb.SBTarget) -> "InstructionBlock":
+        if is_windowed(symbol, target):
+            return cls.window(symbol, target, symbol.GetStartAddress().GetLoadAddress(target))
+
+        flavor = AssemblyModule.settings["disassembly-flavor"].value
+        key = symbol_cache_key(symbol, target, flavor)
+        block = g_disassembly_cache.get(key)
+        if block is None:
+            block = cls.load(symbol, target, flavor)
+            if block is None:
+                code, code_addr = read_symbol_code(symbol, target)
+                block = InstructionBlock(
+                    [
+                        cls.decode(target, symbol, inst, code, code_addr)
+                        for inst in symbol.GetInstructions(target, flavor)
+                    ]
+                )
+                cls.store(symbol, flavor, block, code, code_addr)
+            g_disassembly_cache.put(key, block)
+        return block
+
+    @classmethod
+    def load(cls, symbol: lldb.SBSymbol, target: lldb.SBTarget, flavor: str):
+        start: lldb.SBAddress = symbol.GetStartAddress()
+        uuid: str = start.GetModule().GetUUIDString()
+        if not AssemblyModule.settings["disk-cache"].value or not uuid:
+            return None
+
+        stored = g_disk_cache.load(uuid, flavor, start.GetFileAddress())
+        if stored is None:
+            return None
+
+        start_addr: int = start.GetLoadAddress(target)
+        stored_instructions, code = stored
+        instructions: list[Instruction] = []
+        for offset, size, mnemonic, operands in stored_instructions:
+            instruction = cls(target, symbol, start_addr + offset, size, code[offset : offset + size])
+            instruction.mnemonic = mnemonic
+            instruction.operands = operands
+            instructions.append(instruction)
+        return InstructionBlock(instructions)
+
+    @classmethod
+    def store(cls, symbol: lldb.SBSymbol, flavor: str, block: "InstructionBlock", code: memoryview, code_addr: int):
+        start: lldb.SBAddress = symbol.GetStartAddress()
+        uuid: str = start.GetModule().GetUUIDString()
+        if not AssemblyModule.settings["disk-cache"].value or not uuid or not block.instructions:
+            return
+
+        # Code that could not be read would leave the opcodes blank in every later session
+        last = block.instructions[-1]
+        if len(code) < last.addr + last.size - code_addr:
+            return
+
+        # Comments depend on the load address and are resolved on demand instead
+        stored = [(inst.addr - code_addr, inst.size, inst.mnemonic, inst.operands) for inst in block.instructions]
+        g_disk_cache.store(uuid, flavor, start.GetFileAddress(), stored, code.tobytes())
 
-        addr: lldb.SBAddress = instruction.GetAddress()
-        self.addr: int = addr.GetLoadAddress(target)
+    @classmethod
+    def window(cls, symbol: lldb.SBSymbol, target: lldb.SBTarget, addr: int) -> "InstructionBlock":
+        settings = AssemblyModule.settings
+        count = max(settings["window-size"].value, settings["instructions-after"].value + 1)
+        instructions: lldb.SBInstructionList = target.ReadInstructions(
+            lldb.SBAddress(addr, target), count, settings["disassembly-flavor"].value
+        )
 
-        self.mnemonic: str = instruction.GetMnemonic(target)
-        self.operands: str = instruction.GetOperands(target)
+        insts: list[lldb.SBInstruction] = list(instructions)
+        if symbol.IsValid():
+            end: int = symbol.GetEndAddress().GetLoadAddress(target)
+            insts = [inst for inst in insts if inst.GetAddress().GetLoadAddress(target) < end]
 
-        comment: str = instruction.GetComment(target)
-        self.comment: str = f" ; {comment}" if comment else ""
+        if not insts:
+            return InstructionBlock([])
 
-        self.size: int = instruction.GetByteSize()
+        code_end: int = insts[-1].GetAddress().GetLoadAddress(target) + insts[-1].GetByteSize()
         error = lldb.SBError()
-        opcode: bytearray = target.ReadMemory(addr, self.size, error)
-        self.opcode = " ".join(f"{byte:02X}" for byte in opcode)
+        data: typing.Optional[bytes] = target.ReadMemory(lldb.SBAddress(addr, target), code_end - addr, error)
+        code = memoryview(data if data is not None and error.Success() else b"")
+        return InstructionBlock([cls.decode(target, symbol, inst, code, addr) for inst in insts])
 
-        name: str = symbol.GetDisplayName()
+    @classmethod
+    def backward(
+        cls, symbol: lldb.SBSymbol, target: lldb.SBTarget, arch: Architecture, addr: int, count: int
+    ) -> "InstructionBlock":
+        flavor = AssemblyModule.settings["disassembly-flavor"].value
+        start = region_start(target, symbol, addr)
+        key = region_cache_key(target, start, addr, flavor)
+        block = g_backward_cache.get(key)
+        # A block cached for fewer instructions is fetched again unless it already reaches the region start
+        if block is None or (len(block.instructions) < count and block.addrs and block.addrs[0] > start):
+            insts, code, code_addr = disassemble_backward(target, arch, flavor, start, addr, count)
+            block = InstructionBlock([cls.decode(target, symbol, inst, code, code_addr) for inst in insts])
+            g_backward_cache.put(key, block)
+        return block
+
+    def starts_symbol(self):
+        return self.symbol.IsValid() and self.offset == 0
+
+    def ends_symbol(self):
+        if not self.symbol.IsValid():
+            return False
+        return self.addr + self.size >= self.symbol.GetEndAddress().GetLoadAddress(self.target)
+
+    @functools.cached_property
+    def instruction(self) -> lldb.SBInstruction:
+        instructions: lldb.SBInstructionList = self.target.ReadInstructions(
+            lldb.SBAddress(self.addr, self.target), 1, AssemblyModule.settings["disassembly-flavor"].value
+        )
+        return instructions.GetInstructionAtIndex(0)
+
+    @functools.cached_property
+    def opcode(self):
+        return self.code.hex(" ").upper()
+
+    @functools.cached_property
+    def mnemonic(self) -> str:
+        return self.instruction.GetMnemonic(self.target)
+
+    def resolve_condition(self, arch: Architecture):
+        # Resolved once per instruction, the predictor only evaluates it against the registers of each stop
+        if self.condition_arch is not arch:
+            self.condition = arch.resolve_condition(self.mnemonic, self.operands)
+            self.condition_arch = arch
+        return self.condition
+
+    @functools.cached_property
+    def operands(self) -> str:
+        return self.instruction.GetOperands(self.target)
+
+    @functools.cached_property
+    def comment(self):
+        comment: str = self.instruction.GetComment(self.target)
+        return f" ; {comment}" if comment else ""
+
+    @functools.cached_property
+    def name(self):
+        if not self.symbol.IsValid():
+            return "??"
+        name: str = self.symbol.GetDisplayName()
         if len(name) > 30:
             name = name[:30] + "..."
-        self.name: str = name
+        return name
 
-        self.offset: int = self.addr - symbol.GetStartAddress().GetLoadAddress(target)
-
-    @classmethod
-    def instructions(cls, symbol: lldb.SBSymbol, target: lldb.SBTarget) -> list["Instruction"]:
-        instructions = symbol.GetInstructions(target, AssemblyModule.settings["disassembly-flavor"].value)
-        return [cls(target, symbol, inst) for inst in instructions]
+    @functools.cached_property
+    def offset(self) -> int:
+        return self.addr - self.symbol.GetStartAddress().GetLoadAddress(self.target)
 
     def print(
         self,
         out: Output,
         dim: PrintDimensions,
-        flags: RflagsRegister,
-        reader: RegisterReader,
+        plan: "RenderPlan",
+        predictor: typing.Optional[BranchPredictor],
         color: str,
-        mnemonic: str,
+        mnemonic_color: str,
     ):
-        predict_branching = AssemblyModule.settings["predict-branching"].value
-        branch_taken_marker = AssemblyModule.settings["branch-taken-marker"].value
-        branch_not_taken_marker = AssemblyModule.settings["branch-not-taken-marker"].value
-
-        # Address
-        out.write(f"{color}{self.addr:#0x}{RESET_COLOR}  ")
+        if self.row_key != (plan.epoch, dim):
+            self.compile_row(dim, plan)
 
-        # Opcode
-        if AssemblyModule.settings["show-opcode"].value:
-            out.write(f"{self.opcode:<{dim.opcode_width}}{RESET_COLOR}  ")
+        branch = plan.no_branch
+        if predictor is not None:
+            if (condition := self.resolve_condition(predictor.arch)) is not None:
+                branch = plan.branch_taken if predictor.is_taken(condition) else plan.branch_not_taken
 
-        # Name
-        out.write(f"{color}{self.get_name():<{dim.name_width}}{RESET_COLOR}  ")
+        out.write(f"{color}{self.row_head}{color}{self.row_name}{branch}{mnemonic_color}{self.row_tail}")
 
-        # Branching
-        if predict_branching:
-            if does_branch := BRANCH_MAP.get(self.mnemonic):
-                out.write(branch_taken_marker if does_branch(flags, reader) else branch_not_taken_marker)
-                out.write(" ")
-            else:
-                out.write("  ")
+    def compile_row(self, dim: PrintDimensions, plan: "RenderPlan"):
+        self.row_key = (plan.epoch, dim)
 
-        # Mnemonic
-        out.write(mnemonic)
-        out.write(" " * (dim.mnemonic_width - len(self.mnemonic) + 1))
+        # Address and opcode
+        opcode = f"{self.opcode:<{dim.opcode_width}}{RESET_COLOR}  " if plan.show_opcode else ""
+        self.row_head = f"{self.addr:#0x}{RESET_COLOR}  {opcode}"
 
-        # Operands
-        out.write(self.operands)
+        # Name
+        self.row_name = f"{self.get_name():<{dim.name_width}}{RESET_COLOR}  "
 
-        # Comment
-        out.write(AssemblyModule.settings["text-comment"].value)
-        out.write(self.comment)
-        out.write(RESET_COLOR)
-        out.write("\n")
+        # Mnemonic, operands and comment
+        padding = " " * (dim.mnemonic_width - len(self.mnemonic) + 1)
+        self.row_tail = (
+            f"{self.mnemonic}{RESET_COLOR}{padding}{self.operands}{plan.comment_color}{self.comment}{RESET_COLOR}\n"
+        )
 
     def print_normal(
         self,
         out: Output,
         dim: PrintDimensions,
-        flags: RflagsRegister,
-        reader: RegisterReader,
+        plan: "RenderPlan",
+        predictor: typing.Optional[BranchPredictor],
     ):
         self.print(
             out=out,
             dim=dim,
-            flags=flags,
-            color=Dashboard.settings["text-secondary"].value,
-            mnemonic=f"{AssemblyModule.settings['text-mnemonic']}{self.mnemonic}{RESET_COLOR}",
-            reader=reader,
+            plan=plan,
+            predictor=predictor,
+            color=plan.normal_color,
+            mnemonic_color=plan.mnemonic_color,
         )
 
     def print_highlight(
         self,
         out: Output,
         dim: PrintDimensions,
-        flags: RflagsRegister,
-        reader: RegisterReader,
+        plan: "RenderPlan",
+        predictor: typing.Optional[BranchPredictor],
     ):
         self.print(
             out=out,
             dim=dim,
-            flags=flags,
-            color=Dashboard.settings["text-highlight"].value,
-            mnemonic=f"{AssemblyModule.settings['text-mnemonic']}{FONT_UNDERLINE}{self.mnemonic}{RESET_COLOR}",
-            reader=reader,
+            plan=plan,
+            predictor=predictor,
+            color=plan.highlight_color,
+            mnemonic_color=f"{plan.mnemonic_color}{FONT_UNDERLINE}",
         )
 
     def get_name(self):
+        if not self.symbol.IsValid():
+            return self.name
         return f"{self.name}+{self.offset}"
 
 
+@dataclasses.dataclass
+class RenderPlan:
+    epoch: int
+    show_opcode: bool
+    predict_branching: bool
+    normal_color: str
+    highlight_color: str
+    mnemonic_color: str
+    comment_color: str
+    branch_taken: str
+    branch_not_taken: str
+    no_branch: str
+
+    _instance: typing.ClassVar[typing.Optional["RenderPlan"]] = None
+
+    @classmethod
+    def new_or_cached(cls):
+        if cls._instance is None or cls._instance.epoch != lldbdash.commands.Command.epoch:
+            cls._instance = cls.compile()
+        return cls._instance
+
+    @classmethod
+    def compile(cls):
+        settings = AssemblyModule.settings
+        predict_branching = settings["predict-branching"].value
+        return cls(
+            epoch=lldbdash.commands.Command.epoch,
+            show_opcode=settings["show-opcode"].value,
+            predict_branching=predict_branching,
+            normal_color=Dashboard.settings["text-secondary"].value,
+            highlight_color=Dashboard.settings["text-highlight"].value,
+            mnemonic_color=settings["text-mnemonic"].value,
+            comment_color=settings["text-comment"].value,
+            branch_taken=f"{settings['branch-taken-marker'].value} ",
+            branch_not_taken=f"{settings['branch-not-taken-marker'].value} ",
+            no_branch="  " if predict_branching else "",
+        )
+
+
+class InstructionBlock:
+    def __init__(self, instructions: list[Instruction]):
+        self.instructions = instructions
+        self.addrs = array.array("Q", (inst.addr for inst in instructions))
+
+
+def is_windowed(symbol: lldb.SBSymbol, target: lldb.SBTarget):
+    if not symbol.IsValid():
+        return True
+    size = symbol.GetEndAddress().GetLoadAddress(target) - symbol.GetStartAddress().GetLoadAddress(target)
+    return size > AssemblyModule.settings["window-threshold"].value
+
+
+def read_symbol_code(symbol: lldb.SBSymbol, target: lldb.SBTarget):
+    start: lldb.SBAddress = symbol.GetStartAddress()
+    start_addr: int = start.GetLoadAddress(target)
+    size: int = symbol.GetEndAddress().GetLoadAddress(target) - start_addr
+    error = lldb.SBError()
+    data: typing.Optional[bytes] = target.ReadMemory(start, size, error) if size > 0 else None
+    return memoryview(data if data is not None and error.Success() else b""), start_addr
+
+
 class InstructionPrinter:
-    _frame: lldb.SBFrame | None = None
-    _instance: "InstructionPrinter"
+    _instance: typing.Optional["InstructionPrinter"] = None
 
     def __init__(self, frame: lldb.SBFrame, target: lldb.SBTarget):
         self.frame = frame
         self.target = target
-        self.instructions = Instruction.instructions(frame.GetSymbol(), target)
+        self.arch = select_architecture(target.GetTriple())
+        self.generation = g_disassembly_cache.generation
+
+        symbol: lldb.SBSymbol = frame.GetSymbol()
+        if is_windowed(symbol, target):
+            block = Instruction.window(symbol, target, frame.GetPC())
+        else:
+            block = Instruction.block(symbol, target)
+
+        self.instructions = block.instructions
+        self.addrs = block.addrs
 
     @classmethod
     def new_or_cached(cls, frame: lldb.SBFrame, target: lldb.SBTarget):
-        if cls._frame is None or cls._frame != frame:
-            cls._frame = frame
-            cls._instance = cls(frame, target)
-        return cls._instance
+        instance = cls._instance
+        if (
+            instance is None
+            or instance.generation != g_disassembly_cache.generation
+            or instance.target != target
+            or not instance.extend_to(frame.GetPC())
+        ):
+            instance = cls._instance = cls(frame, target)
+        instance.frame = frame
+        return instance
+
+    def find_idx(self, addr: int):
+        i = bisect.bisect_right(self.addrs, addr) - 1
+        if i < 0 or addr >= self.addrs[i] + self.instructions[i].size:
+            return None
+        return i
+
+    def extend_to(self, addr: int):
+        if not self.instructions or addr < self.addrs[0]:
+            return False
+
+        while self.find_idx(addr) is None:
+            last = self.instructions[-1]
+            end = last.addr + last.size
+            distance = AssemblyModule.settings["window-size"].value * self.arch.max_instruction_size
+            if addr < end or addr - end > distance or last.ends_symbol():
+                return False
+            block = Instruction.window(last.symbol, self.target, end)
+            if not block.instructions:
+                return False
+            self.append(block)
+
+        return True
+
+    def append(self, block: InstructionBlock):
+        self.instructions = self.instructions + block.instructions
+        self.addrs = self.addrs + block.addrs
+
+    def prepend(self, block: InstructionBlock):
+        self.instructions = block.instructions + self.instructions
+        self.addrs = block.addrs + self.addrs
 
     def find_pc_idx(self):
-        pc: int = self.frame.GetPC()
-        for i, inst in enumerate(self.instructions):
-            if inst.addr == pc:
-                return i
-        raise Exception("Program counter is not part of the current instructions")
+        i = self.find_idx(self.frame.GetPC())
+        if i is None:
+            raise Exception("Program counter is not part of the current instructions")
+        return i
 
     def find_print_dimensions(self, start: int, end: int):
         name_width = opcode_width = mnemonic_width = 0
@@ -188,49 +441,54 @@ class InstructionPrinter:
         end = pc_idx + after - padding_after + 1
 
         dimensions = self.find_print_dimensions(start, end)
+        plan = RenderPlan.new_or_cached()
 
-        reader = RegisterReader.new_or_cached(self.frame)
-        flags = reader.read_rflags()
+        predictor = None
+        if plan.predict_branching:
+            predictor = BranchPredictor(self.arch, RegisterReader.new_or_cached(self.frame))
 
-        self.print_instructions(out, dimensions, flags, reader, start, pc_idx)
-        self.instructions[pc_idx].print_highlight(out=out, dim=dimensions, flags=flags, reader=reader)
-        self.print_instructions(out, dimensions, flags, reader, pc_idx + 1, end)
+        self.print_instructions(out, dimensions, plan, predictor, start, pc_idx)
+        self.instructions[pc_idx].print_highlight(out=out, dim=dimensions, plan=plan, predictor=predictor)
+        self.print_instructions(out, dimensions, plan, predictor, pc_idx + 1, end)
 
     def print_instructions(
         self,
         out: Output,
         dimensions: Instruction.PrintDimensions,
-        flags: RflagsRegister,
-        reader: RegisterReader,
+        plan: RenderPlan,
+        predictor: typing.Optional[BranchPredictor],
         start: int,
         end: int,
     ):
         for i in range(start, end):
-            self.instructions[i].print_normal(out=out, dim=dimensions, flags=flags, reader=reader)
+            self.instructions[i].print_normal(out=out, dim=dimensions, plan=plan, predictor=predictor)
 
     def fetch_blocks_start(self, pc_idx: int):
         before = AssemblyModule.settings["instructions-before"].value - pc_idx
 
         while before > 0:
-            addr: lldb.SBAddress = self.instructions[0].symbol.GetStartAddress()
-            addr.SetLoadAddress(addr.GetLoadAddress(self.target) - 1, self.target)
+            first = self.instructions[0]
 
-            context: lldb.SBSymbolContext = self.target.ResolveSymbolContextForAddress(
-                addr, lldb.eSymbolContextEverything
-            )
+            if first.starts_symbol():
+                symbol = g_symbol_indexes.find(self.target, first.addr - 1)
 
-            if not context.IsValid():
-                break
+                if symbol is None:
+                    break
 
-            instructions = Instruction.instructions(context.GetSymbol(), self.target)
+                if is_windowed(symbol, self.target):
+                    block = Instruction.backward(symbol, self.target, self.arch, first.addr, before)
+                else:
+                    block = Instruction.block(symbol, self.target)
+            else:
+                block = Instruction.backward(first.symbol, self.target, self.arch, first.addr, before)
 
-            if not instructions:
+            if not block.instructions:
                 break
 
-            self.instructions = instructions + self.instructions
+            self.prepend(block)
 
-            pc_idx += len(instructions)
-            before -= len(instructions)
+            pc_idx += len(block.instructions)
+            before -= len(block.instructions)
 
         return pc_idx
 
@@ -238,23 +496,24 @@ class InstructionPrinter:
         after = AssemblyModule.settings["instructions-after"].value - len(self.instructions) + pc_idx + 1
 
         while after > 0:
-            addr: lldb.SBAddress = self.instructions[-1].symbol.GetEndAddress()
+            last = self.instructions[-1]
 
-            context: lldb.SBSymbolContext = self.target.ResolveSymbolContextForAddress(
-                addr, lldb.eSymbolContextEverything
-            )
+            if last.ends_symbol():
+                symbol = g_symbol_indexes.find(self.target, last.addr + last.size)
 
-            if not context.IsValid():
-                break
+                if symbol is None:
+                    break
 
-            instructions = Instruction.instructions(context.GetSymbol(), self.target)
+                block = Instruction.block(symbol, self.target)
+            else:
+                block = Instruction.window(last.symbol, self.target, last.addr + last.size)
 
-            if not instructions:
+            if not block.instructions:
                 break
 
-            self.instructions = self.instructions + instructions
+            self.append(block)
 
-            after -= len(instructions)
+            after -= len(block.instructions)
 
 
 if typing.TYPE_CHECKING:
@@ -270,11 +529,45 @@ if typing.TYPE_CHECKING:
             "predict-branching": lldbdash.commands.BoolCommand,
             "branch-taken-marker": lldbdash.commands.StrCommand,
             "branch-not-taken-marker": lldbdash.commands.StrCommand,
+            "cache-size": lldbdash.commands.IntCommand,
+            "window-threshold": lldbdash.commands.IntCommand,
+            "window-size": lldbdash.commands.IntCommand,
+            "disk-cache": lldbdash.commands.BoolCommand,
+            "disk-cache-dir": lldbdash.commands.StrCommand,
+            "disk-cache-size": lldbdash.commands.IntCommand,
             "output": lldbdash.commands.StrCommand,
         },
     )
 
 
+def print_cache_stats(args: list[str], result: lldb.SBCommandReturnObject):
+    for title, cache in (("functions", g_disassembly_cache), ("backward", g_backward_cache), ("disk", g_disk_cache)):
+        result.Print(f"{title}:\n")
+        for name, value in cache.stats().items():
+            result.Print(f"  {name}: {value}\n")
+
+
+def clear_cache(args: list[str], result: lldb.SBCommandReturnObject):
+    for cache in (g_disassembly_cache, g_backward_cache, g_disk_cache):
+        cache.clear()
+        cache.reset_stats()
+
+
+def on_change_flavor(prev_value: str, value: str):
+    g_disassembly_cache.clear()
+    g_backward_cache.clear()
+
+
+def on_change_disk_cache_size(prev_value: int, value: int):
+    g_disk_cache.max_size = value << 20
+    g_disk_cache.shrink()
+
+
+def on_change_cache_size(prev_value: int, value: int):
+    g_disassembly_cache.resize(value)
+    g_backward_cache.resize(value)
+
+
 class AssemblyModule:
     name = "assembly"
     settings: "ModuleSettings" = {
@@ -285,7 +578,9 @@ class AssemblyModule:
             10, help="The number of instructions displayed after the program counter."
         ),
         "disassembly-flavor": lldbdash.commands.StrCommand(
-            "intel", help="The disassembly flavor (default, att, intel)."
+            "intel",
+            help="The disassembly flavor (default, att, intel).",
+            on_change=on_change_flavor,
         ),
         "show-opcode": lldbdash.commands.BoolCommand(True, help="Whether to display the opcode."),
         "text-comment": lldbdash.commands.StrCommand(
@@ -303,6 +598,31 @@ class AssemblyModule:
             f"\033[38;2;215;89;76mn{RESET_COLOR}",
             help='The branch not taken marker displayed when "predict-branching" is enabled.',
         ),
+        "cache-size": lldbdash.commands.IntCommand(
+            64,
+            help="The number of disassembled functions kept in memory.",
+            on_change=on_change_cache_size,
+        ),
+        "window-threshold": lldbdash.commands.IntCommand(
+            0x10000,
+            help="The function size in bytes above which only a window around the program counter is disassembled.",
+        ),
+        "window-size": lldbdash.commands.IntCommand(
+            64, help="The number of instructions disassembled at once in windowed mode."
+        ),
+        "disk-cache": lldbdash.commands.BoolCommand(
+            False, help="Whether to persist disassembled functions on disk across sessions."
+        ),
+        "disk-cache-dir": lldbdash.commands.StrCommand(
+            "~/.cache/lldbdash",
+            help="The directory of the on-disk disassembly cache.",
+            on_change=lambda prev_value, value: g_disk_cache.set_directory(value),
+        ),
+        "disk-cache-size": lldbdash.commands.IntCommand(
+            64,
+            help="The maximum size of the on-disk disassembly cache in MiB.",
+            on_change=on_change_disk_cache_size,
+        ),
         "output": lldbdash.commands.StrCommand(
             "0",
             help="The render location of the assembly module.",
@@ -314,6 +634,12 @@ class AssemblyModule:
         enable_help="Enable the assembly module.",
         disable_help="Disable the assembly module.",
     )
+    commands: Commands = {
+        "cache stats": lldbdash.commands.CallbackCommand(
+            print_cache_stats, help="Print the disassembly cache statistics."
+        ),
+        "cache clear": lldbdash.commands.CallbackCommand(clear_cache, help="Clear the disassembly cache."),
+    }
 
     @staticmethod
     def render(size: os.terminal_size, exe_ctx: lldb.SBExecutionContext, out: Output):
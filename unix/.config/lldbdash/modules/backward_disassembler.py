@@ -0,0 +1,71 @@
+import collections
+import typing
+
+import lldb
+
+from .architecture import Architecture
+
+
+def disassemble_backward(
+    target: lldb.SBTarget, arch: Architecture, flavor: str, region_start: int, addr: int, count: int
+):
+    start = max(region_start, addr - count * arch.max_instruction_size)
+    if start >= addr:
+        return [], memoryview(b""), addr
+
+    error = lldb.SBError()
+    data: typing.Optional[bytes] = target.ReadMemory(lldb.SBAddress(start, target), addr - start, error)
+    if data is None or not error.Success():
+        return [], memoryview(b""), addr
+
+    code = memoryview(data)
+    # A region start is a known instruction boundary, so there is nothing to search
+    if start == region_start:
+        offsets = range(1)
+    else:
+        offsets = range(0, min(arch.max_instruction_size, len(code)), arch.instruction_alignment)
+
+    # Every start offset whose decoding re-synchronizes on addr votes for its instruction boundaries
+    votes = collections.Counter[tuple[int, ...]]()
+    candidates: dict[tuple[int, ...], list[lldb.SBInstruction]] = {}
+
+    for offset in offsets:
+        instructions: lldb.SBInstructionList = target.GetInstructionsWithFlavor(
+            lldb.SBAddress(start + offset, target), flavor, code[offset:].tobytes()
+        )
+
+        insts: list[lldb.SBInstruction] = []
+        addrs: list[int] = []
+        inst_addr = start + offset
+        for inst in instructions:
+            size: int = inst.GetByteSize()
+            if size <= 0:
+                break
+            insts.append(inst)
+            addrs.append(inst_addr)
+            inst_addr += size
+
+        if inst_addr != addr or not insts:
+            continue
+
+        tail = tuple(addrs[-count:])
+        votes[tail] += 1
+        if len(insts) > len(candidates.get(tail, ())):
+            candidates[tail] = insts
+
+    if not votes:
+        return [], memoryview(b""), addr
+
+    tail, _ = votes.most_common(1)[0]
+    return candidates[tail][-count:], code, start
+
+
+def region_start(target: lldb.SBTarget, symbol: lldb.SBSymbol, addr: int) -> int:
+    if symbol.IsValid():
+        return symbol.GetStartAddress().GetLoadAddress(target)
+
+    info = lldb.SBMemoryRegionInfo()
+    error: lldb.SBError = target.GetProcess().GetMemoryRegionInfo(addr, info)
+    if error.Success():
+        return info.GetRegionBase()
+    return 0
@@ -0,0 +1,133 @@
+import typing
+
+
+class BitField(typing.NamedTuple):
+    name: str
+    offset: int
+    width: int
+    group: int
+
+
+# Fields are listed in display order, consecutive fields of one group share a bracket
+RFLAGS_FIELDS = (
+    # Control flags
+    BitField("DF", 10, 1, 0),  # Direction flag
+    # System flags
+    BitField("TF", 8, 1, 1),  # Trap flag
+    BitField("IF", 9, 1, 1),  # Interrupt enable flag
+    BitField("IOPL", 12, 2, 1),  # I/O privilege level
+    BitField("NT", 14, 1, 1),  # Nested task flag
+    BitField("RF", 16, 1, 1),  # Resume flag
+    BitField("VM", 17, 1, 1),  # Virtual 8086 mode flag
+    BitField("AC", 18, 1, 1),  # Alignment check / Access control flag
+    BitField("VIF", 19, 1, 1),  # Virtual interrupt flag
+    BitField("VIP", 20, 1, 1),  # Virtual interrupt pending flag
+    BitField("ID", 21, 1, 1),  # Identification flag
+    # Status flags
+    BitField("CF", 0, 1, 2),  # Carry flag
+    BitField("PF", 2, 1, 2),  # Parity flag
+    BitField("AF", 4, 1, 2),  # Auxiliary carry flag
+    BitField("ZF", 6, 1, 2),  # Zero flag
+    BitField("SF", 7, 1, 2),  # Sign flag
+    BitField("OF", 11, 1, 2),  # Overflow flag
+)
+
+MXCSR_FIELDS = (
+    BitField("FTZ", 15, 1, 0),  # Flush to zero
+    BitField("RC", 13, 2, 0),  # Rounding control
+    BitField("PM", 12, 1, 1),  # Precision mask
+    BitField("UM", 11, 1, 1),  # Underflow mask
+    BitField("OM", 10, 1, 1),  # Overflow mask
+    BitField("ZM", 9, 1, 1),  # Divide-by-zero mask
+    BitField("DM", 8, 1, 1),  # Denormal mask
+    BitField("IM", 7, 1, 1),  # Invalid operation mask
+    BitField("DAZ", 6, 1, 2),  # Denormals are zero
+    BitField("PE", 5, 1, 3),  # Precision flag
+    BitField("UE", 4, 1, 3),  # Underflow flag
+    BitField("OE", 3, 1, 3),  # Overflow flag
+    BitField("ZE", 2, 1, 3),  # Divide-by-zero flag
+    BitField("DE", 1, 1, 3),  # Denormal flag
+    BitField("IE", 0, 1, 3),  # Invalid operation flag
+)
+
+FCTRL_FIELDS = (
+    BitField("X", 12, 1, 0),  # Infinity control
+    BitField("RC", 10, 2, 0),  # Rounding control
+    BitField("PC", 8, 2, 0),  # Precision control
+    BitField("PM", 5, 1, 1),  # Precision mask
+    BitField("UM", 4, 1, 1),  # Underflow mask
+    BitField("OM", 3, 1, 1),  # Overflow mask
+    BitField("ZM", 2, 1, 1),  # Divide-by-zero mask
+    BitField("DM", 1, 1, 1),  # Denormal mask
+    BitField("IM", 0, 1, 1),  # Invalid operation mask
+)
+
+FSTAT_FIELDS = (
+    BitField("B", 15, 1, 0),  # FPU busy
+    BitField("TOP", 11, 3, 0),  # Top of stack pointer
+    BitField("C3", 14, 1, 1),  # Condition codes
+    BitField("C2", 10, 1, 1),
+    BitField("C1", 9, 1, 1),
+    BitField("C0", 8, 1, 1),
+    BitField("ES", 7, 1, 2),  # Exception summary
+    BitField("SF", 6, 1, 2),  # Stack fault
+    BitField("PE", 5, 1, 3),  # Precision flag
+    BitField("UE", 4, 1, 3),  # Underflow flag
+    BitField("OE", 3, 1, 3),  # Overflow flag
+    BitField("ZE", 2, 1, 3),  # Divide-by-zero flag
+    BitField("DE", 1, 1, 3),  # Denormal flag
+    BitField("IE", 0, 1, 3),  # Invalid operation flag
+)
+
+# Two bits per physical register, 3 marks an empty register
+FTAG_FIELDS = tuple(BitField(f"R{i}", i * 2, 2, 0) for i in reversed(range(8)))
+
+CPSR_FIELDS = (
+    BitField("N", 31, 1, 0),  # Negative
+    BitField("Z", 30, 1, 0),  # Zero
+    BitField("C", 29, 1, 0),  # Carry
+    BitField("V", 28, 1, 0),  # Overflow
+    BitField("SS", 21, 1, 1),  # Software step
+    BitField("IL", 20, 1, 1),  # Illegal execution state
+    BitField("D", 9, 1, 2),  # Debug exception mask
+    BitField("A", 8, 1, 2),  # SError mask
+    BitField("I", 7, 1, 2),  # IRQ mask
+    BitField("F", 6, 1, 2),  # FIQ mask
+    BitField("EL", 2, 2, 3),  # Exception level
+    BitField("SP", 0, 1, 3),  # Stack pointer selection
+)
+
+FPSR_FIELDS = (
+    BitField("QC", 27, 1, 0),  # Cumulative saturation
+    BitField("IDC", 7, 1, 1),  # Input denormal
+    BitField("IXC", 4, 1, 1),  # Inexact
+    BitField("UFC", 3, 1, 1),  # Underflow
+    BitField("OFC", 2, 1, 1),  # Overflow
+    BitField("DZC", 1, 1, 1),  # Divide by zero
+    BitField("IOC", 0, 1, 1),  # Invalid operation
+)
+
+FPCR_FIELDS = (
+    BitField("AHP", 26, 1, 0),  # Alternative half precision
+    BitField("DN", 25, 1, 0),  # Default NaN
+    BitField("FZ", 24, 1, 0),  # Flush to zero
+    BitField("RMode", 22, 2, 0),  # Rounding mode
+    BitField("FZ16", 19, 1, 0),  # Flush to zero for half precision
+    BitField("IDE", 15, 1, 1),  # Input denormal trap enable
+    BitField("IXE", 12, 1, 1),  # Inexact trap enable
+    BitField("UFE", 11, 1, 1),  # Underflow trap enable
+    BitField("OFE", 10, 1, 1),  # Overflow trap enable
+    BitField("DZE", 9, 1, 1),  # Divide by zero trap enable
+    BitField("IOE", 8, 1, 1),  # Invalid operation trap enable
+)
+
+FLAG_FIELDS = {
+    "rflags": RFLAGS_FIELDS,
+    "mxcsr": MXCSR_FIELDS,
+    "fctrl": FCTRL_FIELDS,
+    "fstat": FSTAT_FIELDS,
+    "ftag": FTAG_FIELDS,
+    "cpsr": CPSR_FIELDS,
+    "fpsr": FPSR_FIELDS,
+    "fpcr": FPCR_FIELDS,
+}
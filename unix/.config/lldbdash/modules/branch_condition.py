@@ -0,0 +1,7 @@
+import typing
+
+
+class Condition(typing.NamedTuple):
+    code: int
+    register: typing.Optional[str] = None
+    bit: int = 0
@@ -0,0 +1,85 @@
+import typing
+
+from .branch_condition import Condition
+
+# x86 condition codes in their tttn encoding order, odd codes are the negation of the preceding even code
+CC_O, CC_NO, CC_B, CC_AE, CC_E, CC_NE, CC_BE, CC_A, CC_S, CC_NS, CC_P, CC_NP, CC_L, CC_GE, CC_LE, CC_G = range(16)
+# Conditions on the count register
+CC_CXZ, CC_ECXZ, CC_RCXZ, CC_LOOP, CC_LOOPE, CC_LOOPNE = range(16, 22)
+
+CONDITION_SUFFIXES = {
+    "o": CC_O,
+    "no": CC_NO,
+    "b": CC_B,
+    "c": CC_B,
+    "nae": CC_B,
+    "ae": CC_AE,
+    "nb": CC_AE,
+    "nc": CC_AE,
+    "e": CC_E,
+    "z": CC_E,
+    "ne": CC_NE,
+    "nz": CC_NE,
+    "be": CC_BE,
+    "na": CC_BE,
+    "a": CC_A,
+    "nbe": CC_A,
+    "s": CC_S,
+    "ns": CC_NS,
+    "p": CC_P,
+    "pe": CC_P,
+    "np": CC_NP,
+    "po": CC_NP,
+    "l": CC_L,
+    "nge": CC_L,
+    "ge": CC_GE,
+    "nl": CC_GE,
+    "le": CC_LE,
+    "ng": CC_LE,
+    "g": CC_G,
+    "nle": CC_G,
+}
+
+CONDITIONS: dict[str, int] = {
+    f"{prefix}{suffix}": code for prefix in ("j", "cmov", "set") for suffix, code in CONDITION_SUFFIXES.items()
+} | {
+    "jcxz": CC_CXZ,
+    "jecxz": CC_ECXZ,
+    "jrcxz": CC_RCXZ,
+    "loop": CC_LOOP,
+    "loope": CC_LOOPE,
+    "loopz": CC_LOOPE,
+    "loopne": CC_LOOPNE,
+    "loopnz": CC_LOOPNE,
+}
+
+
+def resolve_condition(mnemonic: str, operands: str) -> typing.Optional[Condition]:
+    mnemonic = mnemonic.lower()
+    code = CONDITIONS.get(mnemonic)
+    # AT&T operand size suffix
+    if code is None and mnemonic[-1:] in ("b", "w", "l", "q"):
+        code = CONDITIONS.get(mnemonic[:-1])
+    return Condition(code) if code is not None else None
+
+
+def condition_mask(rflags: int, rcx: int) -> int:
+    cf = rflags & 1
+    pf = (rflags >> 2) & 1
+    zf = (rflags >> 6) & 1
+    sf = (rflags >> 7) & 1
+    of = (rflags >> 11) & 1
+    lt = sf ^ of
+
+    mask = of | cf << CC_B | zf << CC_E | (cf | zf) << CC_BE | sf << CC_S | pf << CC_P | lt << CC_L | (zf | lt) << CC_LE
+    mask |= ((mask ^ 0x5555) & 0x5555) << 1
+
+    counter = rcx != 1
+    mask |= (rcx & 0xFFFF == 0) << CC_CXZ
+    mask |= (rcx & 0xFFFFFFFF == 0) << CC_ECXZ
+    mask |= (rcx == 0) << CC_RCXZ
+    mask |= counter << CC_LOOP
+    mask |= (counter and bool(zf)) << CC_LOOPE
+    mask |= (counter and not zf) << CC_LOOPNE
+
+    return mask
@@ -0,0 +1,73 @@
+import collections
+import typing
+
+import lldb
+
+if typing.TYPE_CHECKING:
+    from .assembly_module import InstructionBlock
+
+CacheKey = tuple[str, int, str]
+
+
+def symbol_cache_key(symbol: lldb.SBSymbol, target: lldb.SBTarget, flavor: str) -> CacheKey:
+    addr: lldb.SBAddress = symbol.GetStartAddress()
+    module: lldb.SBModule = addr.GetModule()
+    return (module.GetUUIDString() or "", addr.GetLoadAddress(target), flavor)
+
+
+def region_cache_key(target: lldb.SBTarget, region_start: int, addr: int, flavor: str) -> CacheKey:
+    module: lldb.SBModule = lldb.SBAddress(addr, target).GetModule()
+    return (f"{module.GetUUIDString() or ''}@{region_start:#x}", addr, flavor)
+
+
+class DisassemblyCache:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.entries = collections.OrderedDict[CacheKey, "InstructionBlock"]()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: CacheKey):
+        block = self.entries.get(key)
+        if block is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return block
+
+    def put(self, key: CacheKey, block: "InstructionBlock"):
+        self.entries[key] = block
+        self.entries.move_to_end(key)
+        self.shrink()
+
+    def resize(self, capacity: int):
+        self.capacity = capacity
+        self.shrink()
+
+    def shrink(self):
+        while len(self.entries) > max(self.capacity, 0):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.generation += 1
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+g_disassembly_cache = DisassemblyCache(64)
+g_backward_cache = DisassemblyCache(64)
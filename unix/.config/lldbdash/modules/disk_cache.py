@@ -0,0 +1,244 @@
+import fcntl
+import mmap
+import os
+import pathlib
+import re
+import struct
+import time
+import typing
+
+FILE_HEADER = struct.Struct("<8sI")
+# Function file address, instruction count, text size, code size
+ENTRY_HEADER = struct.Struct("<QIII")
+# Offset from the function start, size, mnemonic length, operands length
+RECORD = struct.Struct("<IHHH")
+
+MAGIC = b"LLDBDASH"
+VERSION = 1
+# Seconds between two mtime refreshes of the same file, eviction only needs a coarse recency order
+TOUCH_INTERVAL = 60
+
+StoredInstruction = tuple[int, int, str, str]
+
+
+def scan_entries(data: bytes | mmap.mmap, pos: int, offset: int, index: dict[int, int]):
+    while pos + ENTRY_HEADER.size <= len(data):
+        file_addr, count, text_size, code_size = ENTRY_HEADER.unpack_from(data, pos)
+        end = pos + ENTRY_HEADER.size + count * RECORD.size + text_size + code_size
+        if end > len(data):
+            break
+        index[file_addr] = offset + pos
+        pos = end
+    return offset + pos
+
+
+class CacheFile:
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.mm: typing.Optional[mmap.mmap] = None
+        self.index: dict[int, int] = {}
+        self.scanned = FILE_HEADER.size
+        self.inode = -1
+        self.touched = -float("inf")
+
+    def touch(self):
+        now = time.monotonic()
+        if now - self.touched < TOUCH_INTERVAL:
+            return
+        self.touched = now
+        try:
+            os.utime(self.path)
+        except OSError:
+            pass
+
+    def sync(self, fd: int):
+        # Another session may have removed and recreated the file, whatever was indexed belongs to the old one
+        stat = os.fstat(fd)
+        if stat.st_ino != self.inode or stat.st_size < self.scanned:
+            self.inode = stat.st_ino
+            self.index.clear()
+            self.scanned = FILE_HEADER.size
+        return stat.st_size
+
+    def map(self):
+        if self.mm is not None:
+            return self.mm
+
+        try:
+            fd = os.open(self.path, os.O_RDWR)
+        except OSError:
+            return None
+
+        # Appends from other sessions hold the same lock, a partial entry seen under it was never finished
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            size = self.sync(fd)
+            if size < FILE_HEADER.size or FILE_HEADER.unpack(os.pread(fd, FILE_HEADER.size, 0)) != (MAGIC, VERSION):
+                os.remove(self.path)
+                return None
+
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            self.scanned = scan_entries(mm, self.scanned, 0, self.index)
+            if self.scanned < size:
+                mm.close()
+                os.ftruncate(fd, self.scanned)
+                mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        finally:
+            # The mapping keeps a duplicate of the descriptor, closing ours alone would not release the lock
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+        self.mm = mm
+        return mm
+
+    def load(self, file_addr: int):
+        mm = self.map()
+        if mm is None or (pos := self.index.get(file_addr)) is None:
+            return None
+
+        _, count, text_size, code_size = ENTRY_HEADER.unpack_from(mm, pos)
+        records_pos = pos + ENTRY_HEADER.size
+        text_pos = records_pos + count * RECORD.size
+        code_pos = text_pos + text_size
+
+        text = mm[text_pos:code_pos]
+        instructions: list[StoredInstruction] = []
+        i = 0
+        for offset, size, mnemonic_size, operands_size in RECORD.iter_unpack(mm[records_pos:text_pos]):
+            mnemonic = text[i : i + mnemonic_size].decode()
+            i += mnemonic_size
+            operands = text[i : i + operands_size].decode()
+            i += operands_size
+            instructions.append((offset, size, mnemonic, operands))
+
+        return instructions, memoryview(mm)[code_pos : code_pos + code_size]
+
+    def append(self, file_addr: int, instructions: list[StoredInstruction], code: bytes, max_size: int):
+        records = bytearray()
+        text = bytearray()
+        for offset, size, mnemonic, operands in instructions:
+            mnemonic_bytes = mnemonic.encode()
+            operands_bytes = operands.encode()
+            records += RECORD.pack(offset, size, len(mnemonic_bytes), len(operands_bytes))
+            text += mnemonic_bytes
+            text += operands_bytes
+        entry = ENTRY_HEADER.pack(file_addr, len(instructions), len(text), len(code)) + records + text + code
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            size = self.sync(fd)
+            header = b""
+            if size < FILE_HEADER.size or FILE_HEADER.unpack(os.pread(fd, FILE_HEADER.size, 0)) != (MAGIC, VERSION):
+                header = FILE_HEADER.pack(MAGIC, VERSION)
+                pos = 0
+                self.index.clear()
+            else:
+                # Drop whatever a killed session left behind the last complete entry
+                pos = scan_entries(os.pread(fd, size - self.scanned, self.scanned), 0, self.scanned, self.index)
+
+            if pos + len(header) + len(entry) > max_size:
+                return False
+            if pos < size:
+                os.ftruncate(fd, pos)
+            os.pwrite(fd, header + entry, pos)
+            self.index[file_addr] = pos + len(header)
+            self.scanned = pos + len(header) + len(entry)
+        finally:
+            os.close(fd)
+
+        # Views handed out earlier keep the old mapping alive, the next load maps the grown file
+        self.mm = None
+        return True
+
+
+class DiskCache:
+    def __init__(self, directory: str, max_size: int):
+        self.directory = pathlib.Path(directory).expanduser()
+        self.max_size = max_size
+        self.files: dict[str, CacheFile] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def file(self, uuid: str, flavor: str):
+        name = re.sub(r"[^\w.-]", "_", f"{uuid}-{flavor}") + ".bin"
+        file = self.files.get(name)
+        if file is None:
+            file = self.files[name] = CacheFile(self.directory / name)
+        return file
+
+    def load(self, uuid: str, flavor: str, file_addr: int):
+        file = self.file(uuid, flavor)
+        result = file.load(file_addr)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            # Eviction removes the least recently modified files first, so every hit counts as a use
+            file.touch()
+        return result
+
+    def store(self, uuid: str, flavor: str, file_addr: int, instructions: list[StoredInstruction], code: bytes):
+        # A file that alone would outgrow the cap is not appended to, the others are evicted around it
+        file = self.file(uuid, flavor)
+        try:
+            if not file.append(file_addr, instructions, code, self.max_size):
+                return
+        except OSError:
+            return
+        self.shrink(keep=file.path)
+
+    def set_directory(self, directory: str):
+        self.directory = pathlib.Path(directory).expanduser()
+        self.files.clear()
+
+    def cache_files(self):
+        try:
+            return [entry for entry in os.scandir(self.directory) if entry.name.endswith(".bin")]
+        except OSError:
+            return []
+
+    def shrink(self, keep: typing.Optional[pathlib.Path] = None):
+        entries = self.cache_files()
+        size = sum(entry.stat().st_size for entry in entries)
+
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime):
+            if size <= self.max_size:
+                break
+            if keep is not None and pathlib.Path(entry.path) == keep:
+                continue
+            size -= entry.stat().st_size
+            self.remove(entry)
+            self.evictions += 1
+
+    def remove(self, entry: os.DirEntry):
+        self.files.pop(entry.name, None)
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for entry in self.cache_files():
+            self.remove(entry)
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        entries = self.cache_files()
+        return {
+            "files": len(entries),
+            "size": sum(entry.stat().st_size for entry in entries),
+            "max-size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+g_disk_cache = DiskCache("~/.cache/lldbdash", 64 << 20)
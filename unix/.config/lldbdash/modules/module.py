@@ -5,11 +5,12 @@ import typing
 import lldb
 
 import lldbdash.commands
-from lldbdash.common import Output, Settings
+from lldbdash.common import Commands, Output, Settings
 
 
 class Module(typing.Protocol):
     settings: Settings
+    commands: Commands
     name: str
     enabled: lldbdash.commands.ToggleCommand
 
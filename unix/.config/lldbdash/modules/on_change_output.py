@@ -1,6 +1,13 @@
+import functools
+import threading
+
 import lldb
 
-from lldbdash.common import g_file_streams
+from lldbdash.common import FileStreamsEntry, FrameWriter, Screen, g_file_streams, g_render_stats
+from lldbdash.dashboard import write_frame
+
+# Writer threads remove their own entry once they finish, so entries are only touched with this lock held
+g_file_streams_lock = threading.Lock()
 
 
 def on_change_output(prev_output: str, current_output: str):
@@ -12,15 +19,37 @@ def on_change_output(prev_output: str, current_output: str):
 
 
 def add_or_increase(key: str):
-    entry = g_file_streams.setdefault(key, {"stream": lldb.SBStream(), "num_writers": 0})
-    if entry["num_writers"] == 0:
-        entry["stream"].RedirectToFile(key, True)
-    entry["num_writers"] += 1
+    with g_file_streams_lock:
+        # A closed writer may still be writing its last frame, a second stream on the same file would interleave
+        entry = g_file_streams.get(key)
+        if entry is None or entry["num_writers"] == 0 and not entry["writer"].reopen():
+            entry = g_file_streams[key] = new_entry(key)
+        entry["num_writers"] += 1
 
 
 def remove_or_decrease(key: str):
-    entry = g_file_streams[key]
-    entry["num_writers"] -= 1
-    if entry["num_writers"] == 0:
-        entry["stream"].Clear()
-        del g_file_streams[key]
+    with g_file_streams_lock:
+        entry = g_file_streams[key]
+        entry["num_writers"] -= 1
+        if entry["num_writers"] == 0:
+            # The writer thread owns the stream, it is released once the frame being written is done
+            entry["writer"].close()
+
+
+def new_entry(key: str) -> FileStreamsEntry:
+    stream = lldb.SBStream()
+    stream.RedirectToFile(key, True)
+    screen = Screen(key)
+
+    def on_close():
+        stream.Clear()
+        screen.close()
+        with g_file_streams_lock:
+            if g_file_streams.get(key) is entry and entry["num_writers"] == 0:
+                del g_file_streams[key]
+
+    writer = FrameWriter(
+        key, functools.partial(write_frame, stream, output=key, screen=screen), on_close, g_render_stats.add_drop
+    )
+    entry: FileStreamsEntry = {"stream": stream, "num_writers": 0, "screen": screen, "writer": writer}
+    return entry
@@ -3,7 +3,8 @@ import typing
 import lldb
 
 from lldbdash.commands import PureCommand
-from lldbdash.dashboard import is_running, terminal_window_size
+from lldbdash.common import RenderBuffer
+from lldbdash.dashboard import Dashboard, is_running, terminal_window_size, write_frame
 
 if typing.TYPE_CHECKING:
     from lldbdash.modules import Module
@@ -30,7 +31,10 @@ class PrintCommand(PureCommand):
                 if not is_running(_exe_ctx):
                     _result.SetError("Dashboard is not running")
                     return
-                module.render(terminal_window_size(), _exe_ctx, _result)
+                Dashboard.render_count += 1
+                buffer = RenderBuffer()
+                module.render(terminal_window_size(), _exe_ctx, buffer)
+                write_frame(_result, buffer.getvalue())
 
             def get_short_help(self):
                 return help
@@ -1,15 +1,21 @@
-import lldb
+import decimal
+import functools
+import math
+import struct
+import typing
+
+from .bitfields import BitField
 
 
 class GeneralPurposeRegister:
-    def __init__(self, values: list[lldb.SBValue], prev_value: int):
-        self.values = values
-        self.value_int = values[0].GetValueAsSigned()
-        self.value_uint = values[0].GetValueAsUnsigned()
-        self.changed = self.value_uint != prev_value
+    def __init__(self, names: list[str], value: int, prev_value: int, width: int):
+        self.names = names
+        self.value_uint = value
+        self.value_int = value - (1 << width) if value >> (width - 1) else value
+        self.changed = value != prev_value
 
     def get_name_64(self):
-        return "'".join(value.GetName() for value in self.values)
+        return "'".join(self.names)
 
     def get_hex_64(self) -> str:
         return "{:08x}'{:04x}'{:02x}'{:02x}".format(
@@ -27,89 +33,108 @@ class SegmentRegister:
         self.hex_str = f"{value:04x}"
 
 
-class RflagsRegister:
-    def __init__(self, name: str, value: int, prev_value: int):
+class FlagRegister:
+    def __init__(self, name: str, fields: tuple[BitField, ...], value: int, prev_value: int):
         self.name = name
-        self.changed = value != prev_value
-        # Control flags
-        self.df = (value >> 10) & 1  # Direction flag
-        self.df_changed = (prev_value >> 10) & 1 != self.df
-        # System flags
-        self.tf = (value >> 8) & 1  # Trap flag
-        self.tf_changed = (prev_value >> 8) & 1 != self.tf
-        self.if_ = (value >> 9) & 1  # Interrupt enable flag
-        self.if_changed = (prev_value >> 9) & 1 != self.if_
-        self.iopl = (value >> 12) & 3  # I/O privilege level
-        self.iopl_changed = (prev_value >> 12) & 3 != self.iopl
-        self.nt = (value >> 14) & 1  # Nested task flag
-        self.nt_changed = (prev_value >> 14) & 1 != self.nt
-        self.rf = (value >> 16) & 1  # Resume flag
-        self.rf_changed = (prev_value >> 16) & 1 != self.rf
-        self.vm = (value >> 17) & 1  # Virtual 8086 mode flag
-        self.vm_changed = (prev_value >> 17) & 1 != self.vm
-        self.ac = (value >> 18) & 1  # Alignment check / Access control flag
-        self.ac_changed = (prev_value >> 18) & 1 != self.ac
-        self.vif = (value >> 19) & 1  # Virtual interrupt flag
-        self.vif_changed = (prev_value >> 19) & 1 != self.vif
-        self.vip = (value >> 20) & 1  # Virtual interrupt pending flag
-        self.vip_changed = (prev_value >> 20) & 1 != self.vip
-        self.id = (value >> 21) & 1  # Identification flag
-        self.id_changed = (prev_value >> 21) & 1 != self.id
-        # Status flags
-        self.cf = value & 1  # Carry flag
-        self.cf_changed = prev_value & 1 != self.cf
-        self.pf = (value >> 2) & 1  # Parity flag
-        self.pf_changed = (prev_value >> 2) & 1 != self.pf
-        self.af = (value >> 4) & 1  # Auxiliary carry flag
-        self.af_changed = (prev_value >> 4) & 1 != self.af
-        self.zf = (value >> 6) & 1  # Zero flag
-        self.zf_changed = (prev_value >> 6) & 1 != self.zf
-        self.sf = (value >> 7) & 1  # Sign flag
-        self.sf_changed = (prev_value >> 7) & 1 != self.sf
-        self.of = (value >> 11) & 1  # Overflow flag
-        self.of_changed = (prev_value >> 11) & 1 != self.of
-
-
-class MxcsrRegister:
+        self.fields = fields
+        self.value = value
+        self.changed_mask = value ^ prev_value
+        self.changed = self.changed_mask != 0
+
+    def get(self, field: BitField):
+        return self.value >> field.offset & ((1 << field.width) - 1)
+
+    def is_changed(self, field: BitField):
+        return self.changed_mask >> field.offset & ((1 << field.width) - 1) != 0
+
+
+X87_TAGS = ("valid", "zero", "special", "empty")
+
+
+class X87Register:
+    def __init__(self, name: str, physical: int, tag: int, raw: bytes, prev_raw: bytes):
+        self.name = name
+        self.physical = physical
+        self.tag = X87_TAGS[tag]
+        self.raw = raw
+        self.changed = raw != prev_raw
+
+    @functools.cached_property
+    def text(self):
+        return extended_to_str(self.raw)
+
+
+def extended_to_str(raw: bytes):
+    mantissa = int.from_bytes(raw[:8], "little")
+    sign_exponent = int.from_bytes(raw[8:10], "little")
+    sign = "-" if sign_exponent >> 15 else ""
+    exponent = sign_exponent & 0x7FFF
+
+    if exponent == 0x7FFF:
+        return f"{sign}inf" if mantissa & 0x7FFF_FFFF_FFFF_FFFF == 0 else "nan"
+
+    # Denormals use the smallest exponent, the integer bit is explicit in the mantissa
+    exponent = max(exponent, 1) - 16383 - 63
+    try:
+        value = math.ldexp(mantissa, exponent)
+        if value or not mantissa:
+            return f"{sign}{value:.17g}"
+    except OverflowError:
+        pass
+
+    # Out of double range, fall back to an exact decimal rounded to the extended precision
+    context = decimal.Context(prec=19, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+    value = context.multiply(decimal.Decimal(mantissa), context.power(2, exponent))
+    return f"{sign}{value:.18g}"
+
+
+class VectorFormat(typing.NamedTuple):
+    code: str
+    width: int
+    spec: str
+
+
+VECTOR_FORMATS = {
+    "u8": VectorFormat("B", 3, ""),
+    "u16": VectorFormat("H", 5, ""),
+    "u32": VectorFormat("I", 10, ""),
+    "u64": VectorFormat("Q", 20, ""),
+    "i32": VectorFormat("i", 11, ""),
+    "f32": VectorFormat("f", 14, ".7g"),
+    "f64": VectorFormat("d", 24, ".16g"),
+}
+
+
+class VectorRegister:
+    def __init__(self, number: int, raw: bytes, prev_raw: bytes, format: VectorFormat):
+        self.number = number
+        self.raw = raw
+        self.prev_raw = prev_raw
+        self.format = format
+        self.changed = raw != prev_raw
+
+    @functools.cached_property
+    def lanes(self) -> tuple[int | float, ...]:
+        lane_size = struct.calcsize(self.format.code)
+        return struct.unpack(f"<{len(self.raw) // lane_size}{self.format.code}", self.raw)
+
+    @functools.cached_property
+    def diff(self):
+        return int.from_bytes(self.raw, "little") ^ int.from_bytes(self.prev_raw, "little")
+
+    @functools.cached_property
+    def changed_lanes(self):
+        lane_bits = struct.calcsize(self.format.code) * 8
+        lane_mask = (1 << lane_bits) - 1
+        return [self.diff >> (i * lane_bits) & lane_mask != 0 for i in range(len(self.lanes))]
+
+    def changed_bits(self, low: int, high: typing.Optional[int] = None):
+        diff = self.diff >> low
+        return (diff if high is None else diff & ((1 << (high - low)) - 1)) != 0
+
+
+class OpmaskRegister:
     def __init__(self, name: str, value: int, prev_value: int):
         self.name = name
         self.changed = value != prev_value
-        self.ie = value & 1  # Invalid operation flags
-        self.ie_changed = prev_value & 1 != self.ie
-        self.de = (value >> 1) & 1  # Denormal flag
-        self.de_changed = (prev_value >> 1) & 1 != self.de
-        self.ze = (value >> 2) & 1  # Divide-by-zero flag
-        self.ze_changed = (prev_value >> 2) & 1 != self.ze
-        self.oe = (value >> 3) & 1  # Overflow flag
-        self.oe_changed = (prev_value >> 3) & 1 != self.oe
-        self.ue = (value >> 4) & 1  # Underflow flag
-        self.ue_changed = (prev_value >> 4) & 1 != self.ue
-        self.pe = (value >> 5) & 1  # Precision flag
-        self.pe_changed = (prev_value >> 5) & 1 != self.pe
-        self.daz = (value >> 6) & 1  # Denormals are zero
-        self.daz_changed = (prev_value >> 6) & 1 != self.daz
-        self.im = (value >> 7) & 1  # Invalid operation mask
-        self.im_changed = (prev_value >> 7) & 1 != self.im
-        self.dm = (value >> 8) & 1  # Denormal mask
-        self.dm_changed = (prev_value >> 8) & 1 != self.dm
-        self.zm = (value >> 9) & 1  # Divide-by-zero mask
-        self.zm_changed = (prev_value >> 9) & 1 != self.zm
-        self.om = (value >> 10) & 1  # Overflow mask
-        self.om_changed = (prev_value >> 10) & 1 != self.om
-        self.um = (value >> 11) & 1  # Underflow mask
-        self.um_changed = (prev_value >> 11) & 1 != self.um
-        self.pm = (value >> 12) & 1  # Precision mask
-        self.pm_changed = (prev_value >> 12) & 1 != self.pm
-        self.rc = (value >> 13) & 3  # Rounding control
-        self.rc_changed = (prev_value >> 13) & 3 != self.rc
-        self.ftz = (value >> 15) & 1  # Flush to zero
-        self.ftz_changed = (prev_value >> 15) & 1 != self.ftz
-
-
-class AvxRegister:
-    def __init__(self, name_ymm: str, name_xmm: str, values: list[int], prev_values: list[int]):
-        self.name_ymm = name_ymm
-        self.name_xmm = name_xmm
-        self.values = values
-        self.changed_xmm: bool = any(prev_values[i] != values[i] for i in range(16))
-        self.changed_ymm: bool = any(prev_values[i] != values[i] for i in range(16, 32))
+        self.hex_str = f"{value:016x}"
@@ -0,0 +1,55 @@
+import array
+import typing
+
+
+class RegisterHistory:
+    def __init__(self, depth: int, size: int):
+        self.depth = max(depth, 1)
+        self.size = size
+        self.data = bytearray(self.depth * size)
+        self.stop_ids = array.array("Q", bytes(8 * self.depth))
+        self.head = 0
+        self.count = 0
+
+    def append(self, stop_id: int, buffer: bytes | bytearray):
+        start = self.head * self.size
+        self.data[start : start + self.size] = buffer
+        self.stop_ids[self.head] = stop_id
+        self.head = (self.head + 1) % self.depth
+        self.count = min(self.count + 1, self.depth)
+
+    def record(self, stop_id: int, buffer: bytes | bytearray):
+        # Renders within the same stop overwrite its snapshot instead of adding another one
+        if self.count and self.stop_ids[(self.head - 1) % self.depth] == stop_id:
+            start = (self.head - 1) % self.depth * self.size
+            self.data[start : start + self.size] = buffer
+        else:
+            self.append(stop_id, buffer)
+
+    def get(self, n: int) -> typing.Optional[tuple[int, memoryview]]:
+        if not 0 <= n < self.count:
+            return None
+        i = (self.head - 1 - n) % self.depth
+        return self.stop_ids[i], memoryview(self.data)[i * self.size : (i + 1) * self.size]
+
+    def resize(self, depth: int):
+        depth = max(depth, 1)
+        count = min(self.count, depth)
+        data = bytearray(depth * self.size)
+        stop_ids = array.array("Q", bytes(8 * depth))
+
+        # The newest snapshots that still fit are laid out oldest first from slot 0
+        for i in range(count):
+            stop_id, buffer = typing.cast(tuple[int, memoryview], self.get(count - 1 - i))
+            data[i * self.size : (i + 1) * self.size] = buffer
+            stop_ids[i] = stop_id
+
+        self.depth = depth
+        self.data = data
+        self.stop_ids = stop_ids
+        self.count = count
+        self.head = count % depth
+
+
+def diff(buffer: bytes | bytearray | memoryview, other: bytes | bytearray | memoryview):
+    return int.from_bytes(buffer, "little") ^ int.from_bytes(other, "little")
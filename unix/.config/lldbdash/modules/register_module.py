@@ -1,21 +1,27 @@
+import itertools
 import os
 import typing
 
 import lldb
 
 import lldbdash.commands
-from lldbdash.common import FONT_UNDERLINE, RESET_COLOR, Output, batched
+from lldbdash.common import FONT_UNDERLINE, RESET_COLOR, Commands, Output, batched
 from lldbdash.dashboard import Dashboard as D
 
+from .architecture import VectorLabels
 from .on_change_output import on_change_output
 from .register import (
-    AvxRegister,
+    VECTOR_FORMATS,
+    FlagRegister,
     GeneralPurposeRegister,
-    MxcsrRegister,
-    RflagsRegister,
+    OpmaskRegister,
     SegmentRegister,
+    VectorRegister,
+    X87Register,
 )
+from .register_history import diff
 from .register_reader import RegisterReader
+from .telescope import Link, Telescope
 
 if typing.TYPE_CHECKING:
     ModuleSettings = typing.TypedDict(
@@ -23,22 +29,112 @@ if typing.TYPE_CHECKING:
         {
             "show-decimal": lldbdash.commands.BoolCommand,
             "show-segment": lldbdash.commands.BoolCommand,
+            "show-telescope": lldbdash.commands.BoolCommand,
+            "telescope-depth": lldbdash.commands.IntCommand,
+            "telescope-budget": lldbdash.commands.IntCommand,
             "show-rflags": lldbdash.commands.BoolCommand,
             "show-mxcsr": lldbdash.commands.BoolCommand,
+            "show-fpu": lldbdash.commands.BoolCommand,
             "show-vector": lldbdash.commands.BoolCommand,
+            "vector-format": lldbdash.commands.StrCommand,
+            "vector-registers": lldbdash.commands.StrCommand,
+            "vector-changed-only": lldbdash.commands.BoolCommand,
+            "reader-cache-size": lldbdash.commands.IntCommand,
+            "history-depth": lldbdash.commands.IntCommand,
             "output": lldbdash.commands.StrCommand,
         },
     )
 
 
+def on_change_vector_format(prev_value: str, value: str):
+    if value not in VECTOR_FORMATS:
+        raise ValueError(f"Invalid argument {value} must be one of {', '.join(VECTOR_FORMATS)}")
+
+
+def print_history(args: list[str], result: lldb.SBCommandReturnObject):
+    reader = RegisterReader.current()
+    if reader is None:
+        result.SetError("No registers have been read yet")
+        return
+    if reader.history is None:
+        result.SetError("Register history is only kept for frame 0")
+        return
+
+    history = reader.history
+    for n in range(history.count):
+        stop_id, buffer = typing.cast(tuple[int, memoryview], history.get(n))
+        prev = history.get(n + 1)
+        changed = [name for name, _, _ in reader.changes(diff(buffer, prev[1]))] if prev else []
+        result.Print(f"{n:>3}  stop {stop_id:<8} {' '.join(changed) if changed else '-'}\n")
+
+
+def print_diff(args: list[str], result: lldb.SBCommandReturnObject):
+    reader = RegisterReader.current()
+    if reader is None:
+        result.SetError("No registers have been read yet")
+        return
+    if reader.history is None:
+        result.SetError("Register history is only kept for frame 0")
+        return
+
+    try:
+        n = int(args[0]) if args else 1
+    except ValueError:
+        result.SetError(f"Invalid argument {args[0]} must be convertible to int")
+        return
+
+    # Compared with what the dashboard shows, which includes register writes made since the stop
+    past = reader.history.get(n)
+    if past is None:
+        result.SetError(f"Only {reader.history.count - 1} earlier stops are remembered")
+        return
+
+    result.Print(f"stop {past[0]} -> stop {reader.stop_id}\n")
+    for name, offset, size in reader.changes(diff(reader.buffer, past[1])):
+        old = int.from_bytes(past[1][offset : offset + size], "little")
+        new = int.from_bytes(reader.buffer[offset : offset + size], "little")
+        result.Print(f"{name:>8} {old:0{size * 2}x} -> {new:0{size * 2}x}\n")
+
+
 class RegisterModule:
     name = "register"
     settings: "ModuleSettings" = {
         "show-decimal": lldbdash.commands.BoolCommand(True, help="Display the general purpose register decimal value."),
         "show-segment": lldbdash.commands.BoolCommand(True, help="Display the segment registers."),
-        "show-rflags": lldbdash.commands.BoolCommand(True, help="Display the rflags register."),
-        "show-mxcsr": lldbdash.commands.BoolCommand(True, help="Display the mxcsr register."),
+        "show-telescope": lldbdash.commands.BoolCommand(
+            False, help="Display the pointer chains the general purpose registers point to."
+        ),
+        "telescope-depth": lldbdash.commands.IntCommand(3, help="The number of pointers followed from each register."),
+        "telescope-budget": lldbdash.commands.IntCommand(
+            4096, help="The number of bytes of memory read per stop to follow the pointer chains."
+        ),
+        "show-rflags": lldbdash.commands.BoolCommand(True, help="Display the rflags (cpsr) register."),
+        "show-mxcsr": lldbdash.commands.BoolCommand(True, help="Display the mxcsr (fpsr and fpcr) register."),
+        "show-fpu": lldbdash.commands.BoolCommand(
+            False, help="Display the x87 register stack and its control registers."
+        ),
         "show-vector": lldbdash.commands.BoolCommand(True, help="Display the vector registers."),
+        "vector-format": lldbdash.commands.StrCommand(
+            "u8",
+            help="The lane type of the vector registers (u8, u16, u32, u64, i32, f32 or f64).",
+            on_change=on_change_vector_format,
+        ),
+        "vector-registers": lldbdash.commands.StrCommand(
+            "", help="The numbers of the vector registers to display, e.g. 0-7,16. All are displayed when empty."
+        ),
+        "vector-changed-only": lldbdash.commands.BoolCommand(
+            False, help="Display only the vector registers that changed since the last stop."
+        ),
+        "reader-cache-size": lldbdash.commands.IntCommand(
+            64,
+            help="The number of threads and frames whose registers are remembered for change highlighting.",
+            on_change=lambda prev_value, value: RegisterReader.resize(value),
+        ),
+        "history-depth": lldbdash.commands.IntCommand(
+            16,
+            help="The number of stops whose registers are kept per thread for the history and diff commands.",
+            on_change=lambda prev_value, value: RegisterReader.resize_history(value),
+        ),
         "output": lldbdash.commands.StrCommand(
             "0",
             help="The render location of the register module.",
@@ -50,59 +146,68 @@ class RegisterModule:
         enable_help="Enable the register module",
         disable_help="Disable the register module",
     )
+    commands: Commands = {
+        "history": lldbdash.commands.CallbackCommand(
+            print_history, help="List the remembered stops and the registers changed at each of them."
+        ),
+        "diff": lldbdash.commands.CallbackCommand(
+            print_diff, help="Print the registers changed since <n> stops ago (default 1)."
+        ),
+    }
 
     @staticmethod
     def render(size: os.terminal_size, exe_ctx: lldb.SBExecutionContext, out: Output):
         frame: lldb.SBFrame = exe_ctx.GetFrame()
         reader = RegisterReader.new_or_cached(frame)
 
-        write_gp(
-            out,
-            [
-                reader.read_gp("rax"),
-                reader.read_gp("rbx"),
-                reader.read_gp("rcx"),
-                reader.read_gp("rdx"),
-                reader.read_gp("rdi"),
-                reader.read_gp("rsi"),
-                reader.read_gp("rbp"),
-                reader.read_gp("rsp"),
-                reader.read_gp("r8"),
-                reader.read_gp("r9"),
-                reader.read_gp("r10"),
-                reader.read_gp("r11"),
-                reader.read_gp("r12"),
-                reader.read_gp("r13"),
-                reader.read_gp("r14"),
-                reader.read_gp("r15"),
-            ],
-            size.columns // 40,
-        )
-
-        if RegisterModule.settings["show-segment"]:
-            write_segment(
-                out,
-                [
-                    reader.read_segment("cs"),
-                    reader.read_segment("ss"),
-                    reader.read_segment("ds"),
-                    reader.read_segment("es"),
-                    reader.read_segment("fs"),
-                    reader.read_segment("gs"),
-                ],
+        arch = reader.layout.arch
+        slots = reader.layout.slots
+
+        gp_regs = [reader.read_gp(name) for name in reader.layout.gp_names]
+        write_gp(out, gp_regs, size.columns // 40)
+
+        if RegisterModule.settings["show-telescope"]:
+            telescope = Telescope.new_or_cached(frame.GetThread().GetProcess())
+            links = telescope.follow(
+                [reg.value_uint for reg in gp_regs],
+                RegisterModule.settings["telescope-depth"].value,
+                RegisterModule.settings["telescope-budget"].value,
             )
+            write_telescope(out, gp_regs, links)
+
+        segments = [name for name in arch.segment_registers if name in slots]
+        if RegisterModule.settings["show-segment"] and segments:
+            write_segment(out, [reader.read_segment(name) for name in segments])
 
-        if RegisterModule.settings["show-rflags"]:
-            write_rflags(out, reader.read_rflags())
+        if RegisterModule.settings["show-rflags"] and arch.flags_register in slots:
+            write_flags(out, reader.read_flags(arch.flags_register))
 
         if RegisterModule.settings["show-vector"]:
-            write_avx(
-                out,
-                [reader.read_avx(f"ymm{i}") for i in range(16)],
-            )
+            format = VECTOR_FORMATS[RegisterModule.settings["vector-format"].value]
+            numbers = parse_numbers(RegisterModule.settings["vector-registers"].value)
+            changed_only = RegisterModule.settings["vector-changed-only"].value
+            regs = [
+                reg
+                for reg in (
+                    reader.read_vector(name, format)
+                    for i, name in enumerate(reader.layout.vector_names)
+                    if numbers is None or i in numbers
+                )
+                if reg.changed or not changed_only
+            ]
+            write_vector(out, regs, arch.vector_labels)
+            write_opmask(out, [reader.read_opmask(name) for name in reader.layout.opmask_names])
 
         if RegisterModule.settings["show-mxcsr"]:
-            write_mxcsr(out, reader.read_mxcsr())
+            for name in arch.control_registers:
+                if name in slots:
+                    write_flags(out, reader.read_flags(name))
+
+        if RegisterModule.settings["show-fpu"]:
+            for name in arch.fpu_registers:
+                if name in slots:
+                    write_flags(out, reader.read_flags(name))
+            write_x87(out, [reader.read_x87(i) for i in range(len(reader.layout.x87_names))])
 
 
 def write_gp(out: Output, regs: list[GeneralPurposeRegister], per_row: int):
@@ -121,6 +226,20 @@ def write_gp(out: Output, regs: list[GeneralPurposeRegister], per_row: int):
             out.write("\n")
 
 
+def write_telescope(out: Output, regs: list[GeneralPurposeRegister], links: list[Link]):
+    secondary = D.settings["text-secondary"].value
+    arrow = f" {secondary}->{RESET_COLOR} "
+    for reg, link in zip(regs, links):
+        if not link.addrs and not link.text:
+            continue
+        out.write(f"{secondary}{reg.names[0]:>5}{RESET_COLOR} {reg.value_uint:#x}")
+        for addr in link.addrs:
+            out.write(f"{arrow}{addr:#x}")
+        if link.text:
+            out.write(f"{arrow}{D.settings['text-highlight'].value if link.code else ''}{link.text}{RESET_COLOR}")
+        out.write("\n")
+
+
 def write_gp_hex(out: Output, reg: GeneralPurposeRegister):
     out.write(D.settings["text-highlight"].value if reg.changed else D.settings["text-secondary"].value)
     out.write(f"{reg.get_name_64():>18}")
@@ -133,52 +252,7 @@ def write_gp_decimal(out: Output, reg: GeneralPurposeRegister):
     out.write(f"{reg.value_int:>38}")
 
 
-def write_rflags(out: Output, flags: RflagsRegister):
-    highlight = D.settings["text-highlight"].value
-    secondary = D.settings["text-secondary"].value
-    open_bracket = f"{secondary}{{{RESET_COLOR}"
-    close_bracket = f"{secondary}}}{RESET_COLOR}"
-    out.write(highlight if flags.changed else secondary)
-    out.write(flags.name)
-    out.write(RESET_COLOR)
-    out.write(f" {open_bracket} ")
-    write_flag(out, "DF", flags.df, flags.df_changed)
-    out.write(f" {close_bracket} {open_bracket} ")
-    write_flag(out, "TF", flags.tf, flags.tf_changed)
-    out.write(" ")
-    write_flag(out, "IF", flags.if_, flags.if_changed)
-    out.write(" ")
-    write_flag(out, "IOPL", flags.iopl, flags.iopl_changed)
-    out.write(" ")
-    write_flag(out, "NT", flags.nt, flags.nt_changed)
-    out.write(" ")
-    write_flag(out, "RF", flags.rf, flags.rf_changed)
-    out.write(" ")
-    write_flag(out, "VM", flags.vm, flags.vm_changed)
-    out.write(" ")
-    write_flag(out, "AC", flags.ac, flags.ac_changed)
-    out.write(" ")
-    write_flag(out, "VIF", flags.vif, flags.vif_changed)
-    out.write(" ")
-    write_flag(out, "VIP", flags.vip, flags.vip_changed)
-    out.write(" ")
-    write_flag(out, "ID", flags.id, flags.id_changed)
-    out.write(f" {close_bracket} {open_bracket} ")
-    write_flag(out, "CF", flags.cf, flags.cf_changed)
-    out.write(" ")
-    write_flag(out, "PF", flags.pf, flags.pf_changed)
-    out.write(" ")
-    write_flag(out, "AF", flags.af, flags.af_changed)
-    out.write(" ")
-    write_flag(out, "ZF", flags.zf, flags.zf_changed)
-    out.write(" ")
-    write_flag(out, "SF", flags.sf, flags.sf_changed)
-    out.write(" ")
-    write_flag(out, "OF", flags.of, flags.of_changed)
-    out.write(f" {close_bracket}\n")
-
-
-def write_mxcsr(out: Output, flags: MxcsrRegister):
+def write_flags(out: Output, flags: FlagRegister):
     highlight = D.settings["text-highlight"].value
     secondary = D.settings["text-secondary"].value
     open_bracket = f"{secondary}{{{RESET_COLOR}"
@@ -186,36 +260,12 @@ def write_mxcsr(out: Output, flags: MxcsrRegister):
     out.write(highlight if flags.changed else secondary)
     out.write(flags.name)
     out.write(RESET_COLOR)
-    out.write(f" {open_bracket} ")
-    write_flag(out, "FTZ", flags.ftz, flags.ftz_changed)
-    out.write(" ")
-    write_flag(out, "RC", flags.rc, flags.rc_changed)
-    out.write(f" {close_bracket} {open_bracket} ")
-    write_flag(out, "PM", flags.pm, flags.pm_changed)
-    out.write(" ")
-    write_flag(out, "UM", flags.um, flags.um_changed)
-    out.write(" ")
-    write_flag(out, "OM", flags.om, flags.om_changed)
-    out.write(" ")
-    write_flag(out, "ZM", flags.zm, flags.zm_changed)
-    out.write(" ")
-    write_flag(out, "DM", flags.dm, flags.dm_changed)
-    out.write(" ")
-    write_flag(out, "IM", flags.im, flags.im_changed)
-    out.write(f" {close_bracket} {open_bracket} ")
-    write_flag(out, "DAZ", flags.daz, flags.daz_changed)
-    out.write(f" {close_bracket} {open_bracket} ")
-    write_flag(out, "PE", flags.pe, flags.pe_changed)
-    out.write(" ")
-    write_flag(out, "UE", flags.ue, flags.ue_changed)
-    out.write(" ")
-    write_flag(out, "OE", flags.oe, flags.oe_changed)
-    out.write(" ")
-    write_flag(out, "ZE", flags.ze, flags.ze_changed)
-    out.write(" ")
-    write_flag(out, "DE", flags.de, flags.de_changed)
-    out.write(" ")
-    write_flag(out, "IE", flags.ie, flags.ie_changed)
+    for i, (_, fields) in enumerate(itertools.groupby(flags.fields, key=lambda field: field.group)):
+        out.write(f" {close_bracket} {open_bracket} " if i else f" {open_bracket} ")
+        for j, field in enumerate(fields):
+            if j:
+                out.write(" ")
+            write_flag(out, field.name, flags.get(field), flags.is_changed(field))
     out.write(f" {close_bracket}\n")
 
 
@@ -228,29 +278,86 @@ def write_flag(out: Output, name: str, value: int, changed: bool):
     out.write(RESET_COLOR)
 
 
-def write_avx(out: Output, regs: list[AvxRegister]):
+def write_vector(out: Output, regs: list[VectorRegister], labels: VectorLabels):
     highlight = D.settings["text-highlight"].value
     secondary = D.settings["text-secondary"].value
 
-    out.write(f"     {secondary}")
-    for i in reversed(range(16, 32)):
-        out.write(f" {i:>3}")
-    out.write("      ")
-    for i in reversed(range(16)):
-        out.write(f" {i:>3}")
-    out.write(f"{RESET_COLOR}\n")
+    if not regs:
+        return
+
+    format = regs[0].format
+    chunks = len(regs[0].raw) // 16
+    chunk_lanes = len(regs[0].lanes) // chunks
+
+    # Registers wider than two chunks span several rows, each gets a header with its own lane numbers
+    for row in reversed(range(0, chunks, 2)):
+        out.write(f"     {secondary}")
+        for c in reversed(range(row, min(row + 2, chunks))):
+            if c < min(row + 2, chunks) - 1:
+                out.write("      ")
+            for i in reversed(range(c * chunk_lanes, (c + 1) * chunk_lanes)):
+                out.write(f" {i:>{format.width}}")
+        out.write(f"{RESET_COLOR}\n")
 
     for reg in regs:
-        out.write(highlight if reg.changed_ymm else secondary)
-        out.write(f"{reg.name_ymm:>5}")
+        for row in reversed(range(0, chunks, 2)):
+            for c in reversed(range(row, min(row + 2, chunks))):
+                label = labels.get(c)
+                out.write(highlight if label is not None and reg.changed_bits(*label[1:]) else secondary)
+                out.write(" " if c < min(row + 2, chunks) - 1 else "")
+                out.write(f"{f'{label[0]}{reg.number}' if label is not None else '':>5}")
+                out.write(RESET_COLOR)
+                for i in reversed(range(c * chunk_lanes, (c + 1) * chunk_lanes)):
+                    write_lane(out, reg, i)
+            out.write("\n")
+
+
+def write_lane(out: Output, reg: VectorRegister, i: int):
+    out.write(" ")
+    if reg.changed_lanes[i]:
+        out.write(FONT_UNDERLINE)
+        out.write(f"{reg.lanes[i]:>{reg.format.width}{reg.format.spec}}")
         out.write(RESET_COLOR)
-        for i in reversed(range(16, 32)):
-            out.write(f" {reg.values[i]:>3}")
-        out.write(highlight if reg.changed_xmm else secondary)
-        out.write(f" {reg.name_xmm:>5}")
+    else:
+        out.write(f"{reg.lanes[i]:>{reg.format.width}{reg.format.spec}}")
+
+
+def write_opmask(out: Output, regs: list[OpmaskRegister]):
+    highlight = D.settings["text-highlight"].value
+    secondary = D.settings["text-secondary"].value
+    for batch in batched(regs, 4):
+        for i, reg in enumerate(batch):
+            if i:
+                out.write("  ")
+            out.write(highlight if reg.changed else secondary)
+            out.write(f"{reg.name:>5}")
+            out.write(RESET_COLOR)
+            out.write(f" {reg.hex_str}")
+        out.write("\n")
+
+
+def parse_numbers(spec: str) -> typing.Optional[set[int]]:
+    numbers = set[int]()
+    for part in spec.replace(",", " ").split():
+        first, _, last = part.partition("-")
+        try:
+            numbers.update(range(int(first), int(last or first) + 1))
+        except ValueError:
+            continue
+    return numbers or None
+
+
+def write_x87(out: Output, regs: list[X87Register]):
+    highlight = D.settings["text-highlight"].value
+    secondary = D.settings["text-secondary"].value
+    for reg in regs:
+        out.write(highlight if reg.changed else secondary)
+        out.write(f"{reg.name:>5}")
         out.write(RESET_COLOR)
-        for i in reversed(range(16)):
-            out.write(f" {reg.values[i]:>3}")
+        out.write(f" {secondary}R{reg.physical} {reg.tag:<7}{RESET_COLOR}")
+        # Empty slots hold stale data, only live ones are decoded
+        if reg.tag != "empty":
+            out.write(f" {reg.text:>26} {reg.raw[::-1].hex()}")
         out.write("\n")
 
 
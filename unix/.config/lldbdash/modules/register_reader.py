@@ -1,196 +1,291 @@
-import dataclasses
+import collections
+import itertools
+import string
+import threading
 import typing
 
 import lldb
 
+from lldbdash.dashboard import Dashboard
+
+from .architecture import Architecture, select_architecture
+from .bitfields import FLAG_FIELDS
 from .register import (
-    AvxRegister,
+    VECTOR_FORMATS,
+    FlagRegister,
     GeneralPurposeRegister,
-    MxcsrRegister,
-    RflagsRegister,
+    OpmaskRegister,
     SegmentRegister,
+    VectorFormat,
+    VectorRegister,
+    X87Register,
 )
+from .register_history import RegisterHistory
 
 
-@dataclasses.dataclass
-class Entry:
-    indices: list[int]
-    values: list[int]
-    prev_values: list[int] = dataclasses.field(init=False)
-    pc: int
-    pc_change_count = -1
+def numbered(index: typing.Container[str], prefix: str):
+    return list(itertools.takewhile(index.__contains__, (f"{prefix}{i}" for i in itertools.count())))
 
-    def __post_init__(self):
-        self.prev_values = self.values.copy()
 
+class Slot(typing.NamedTuple):
+    offset: int
+    size: int
 
-Entries = dict[str, Entry]
 
+class Alias(typing.NamedTuple):
+    base: str
+    width: int
+    names: list[str]
 
-class RegisterReader:
-    _frame: lldb.SBFrame
-    _instance: typing.Optional["RegisterReader"] = None
-
-    def __init__(self, frame: lldb.SBFrame):
-        self.entries = Entries()
-
-        self.update_reg_sets(frame)
-        pc = frame.GetPC()
-
-        gp_index = dict[str, int]((t[1].GetName(), t[0]) for t in enumerate(self.gp_reg_set))
-        fp_index = dict[str, int]((t[1].GetName(), t[0]) for t in enumerate(self.fp_reg_set))
-        avx_index = dict[str, int]((t[1].GetName(), t[0]) for t in enumerate(self.avx_reg_set))
-
-        for regs in (
-            ["rax", "eax", "ax", "al"],
-            ["rbx", "ebx", "bx", "bl"],
-            ["rcx", "ecx", "cx", "cl"],
-            ["rdx", "edx", "dx", "dl"],
-            ["rsi", "esi", "si", "sil"],
-            ["rdi", "edi", "di", "dil"],
-            ["rbp", "ebp", "bp", "bpl"],
-            ["rsp", "esp", "sp", "spl"],
-            ["r8", "r8d", "r8w", "r8l"],
-            ["r9", "r9d", "r9w", "r9l"],
-            ["r10", "r10d", "r10w", "r10l"],
-            ["r11", "r11d", "r11w", "r11l"],
-            ["r12", "r12d", "r12w", "r12l"],
-            ["r13", "r13d", "r13w", "r13l"],
-            ["r14", "r14d", "r14w", "r14l"],
-            ["r15", "r15d", "r15w", "r15l"],
-        ):
-            idx_64 = gp_index.get(regs[0])
-            idx_32 = gp_index.get(regs[1])
-            idx_16 = gp_index.get(regs[2])
-            idx_8 = gp_index.get(regs[3])
-
-            if idx_64 is not None:
-                self.entries[regs[0]] = Entry(
-                    [
-                        idx_64,
-                        typing.cast(int, idx_32),
-                        typing.cast(int, idx_16),
-                        typing.cast(int, idx_8),
-                    ],
-                    [self.gp_reg_set.GetChildAtIndex(idx_64).GetValueAsUnsigned()],
-                    pc,
-                )
-
-            if idx_32 is not None:
-                self.entries[regs[1]] = Entry(
-                    [idx_32, typing.cast(int, idx_16), typing.cast(int, idx_8)],
-                    [self.gp_reg_set.GetChildAtIndex(idx_32).GetValueAsUnsigned()],
-                    pc,
-                )
-
-            if idx_16 is not None:
-                self.entries[regs[2]] = Entry(
-                    [idx_16, typing.cast(int, idx_8)],
-                    [self.gp_reg_set.GetChildAtIndex(idx_16).GetValueAsUnsigned()],
-                    pc,
-                )
-
-            if idx_8 is not None:
-                self.entries[regs[3]] = Entry(
-                    [idx_8],
-                    [self.gp_reg_set.GetChildAtIndex(idx_8).GetValueAsUnsigned()],
-                    pc,
-                )
-
-        for reg in ["cs", "ds", "ss", "es", "fs", "gs", "rflags"]:
-            index = gp_index.get(reg)
-            if index is None:
-                continue
-            values = [self.gp_reg_set.GetChildAtIndex(index).GetValueAsUnsigned()]
-            self.entries[reg] = Entry([index], values, pc)
 
-        for i in range(16):
-            xmm = f"xmm{i}"
-            index = fp_index.get(xmm)
-            if index is None:
-                continue
-            values = [child.GetValueAsUnsigned() for child in self.fp_reg_set.GetChildAtIndex(index)]
-            self.entries[xmm] = Entry([index], values, pc)
+class RegisterLayout:
+    _instance: typing.Optional["RegisterLayout"] = None
+    _process_id = -1
 
-        for reg in ["mxcsr"]:
-            index = fp_index.get(reg)
-            if index is None:
-                continue
-            values = [self.fp_reg_set.GetChildAtIndex(index).GetValueAsUnsigned()]
-            self.entries[reg] = Entry([index], values, pc)
-
-        for i in range(16):
-            ymm = f"ymm{i}"
-            xmm = f"xmm{i}"
-            index = avx_index.get(ymm)
-            if index is None:
+    def __init__(self, frame: lldb.SBFrame, arch: Architecture):
+        self.arch = arch
+        self.slots = dict[str, Slot]()
+        self.aliases = dict[str, Alias]()
+        self.names = dict[str, str]()
+        self.entries: list[tuple[int, int, int, int]] = []
+        self.update_layout(list(frame.GetRegisters()))
+
+    @classmethod
+    def new_or_cached(cls, frame: lldb.SBFrame, process_id: int):
+        if cls._instance is None or cls._process_id != process_id:
+            thread: lldb.SBThread = frame.GetThread()
+            triple: str = thread.GetProcess().GetTarget().GetTriple()
+            cls._instance = cls(frame, select_architecture(triple))
+            cls._process_id = process_id
+        return cls._instance
+
+    def update_layout(self, reg_sets: list[lldb.SBValue]):
+        # Registers are looked up by name across all register sets, the first set that has one wins
+        index = dict[str, tuple[int, int]]()
+        for i, reg_set in enumerate(reg_sets):
+            for j, reg in enumerate(reg_set):
+                index.setdefault(reg.GetName(), (i, j))
+
+        # Only the widest view of each register is read, the narrower views are masked out of it
+        offset = 0
+
+        def add(name: str):
+            nonlocal offset
+            i, j = index[name]
+            value: lldb.SBValue = reg_sets[i].GetChildAtIndex(j)
+            size: int = value.GetByteSize()
+            self.entries.append((i, j, offset, size))
+            self.slots[name] = Slot(offset, size)
+            self.names[name] = value.GetName()
+            offset += size
+
+        arch = self.arch
+        self.gp_names: list[str] = []
+        for regs in arch.gp_registers:
+            names = [reg for reg in regs if reg in index]
+            if regs[0] not in index:
                 continue
-            values = [child.GetValueAsUnsigned() for child in self.avx_reg_set.GetChildAtIndex(index)]
-            self.entries[ymm] = Entry([index, fp_index[xmm]], values, pc)
+            add(regs[0])
+            self.gp_names.append(regs[0])
+            for i, reg in enumerate(regs):
+                if reg in index:
+                    self.aliases[reg] = Alias(regs[0], arch.gp_widths[i], names[names.index(reg) :])
+
+        for reg in (*arch.segment_registers, arch.flags_register, *arch.control_registers, *arch.fpu_registers):
+            if reg in index:
+                add(reg)
+
+        self.x87_names = numbered(index, arch.x87_prefix) if arch.x87_prefix else []
+        for name in self.x87_names:
+            add(name)
+
+        # The widest vector family holds the narrower ones in its low bytes
+        self.vector_names: list[str] = []
+        for family in arch.vector_families:
+            self.vector_names = numbered(index, family)
+            if self.vector_names:
+                break
+        for name in self.vector_names:
+            add(name)
+
+        self.opmask_names = numbered(index, arch.opmask_prefix) if arch.opmask_prefix else []
+        for name in self.opmask_names:
+            add(name)
+
+        self.size = offset
+
+
+ReaderKey = tuple[int, int, int]
+ThreadKey = tuple[int, int]
+
+
+class RegisterReader:
+    _instances = collections.OrderedDict[ReaderKey, "RegisterReader"]()
+    # Only the innermost frame holds the registers the thread stopped with, the outer frames are unwound views
+    _histories = dict[ThreadKey, RegisterHistory]()
+    _current: typing.Optional["RegisterReader"] = None
+    _render_count = -1
+    # Modules rendered in parallel share the reader of the stop
+    _lock = threading.Lock()
+    capacity = 64
+    history_depth = 16
+
+    def __init__(
+        self,
+        layout: RegisterLayout,
+        frame: lldb.SBFrame,
+        stop_id: int,
+        history: typing.Optional[RegisterHistory],
+    ):
+        self.layout = layout
+        self.stop_id = stop_id
+        self.buffer = self.snapshot(frame)
+        self.prev_buffer = self.buffer
+        self.x87 = dict[int, X87Register]()
+        self.history = history
+        if history is not None:
+            history.record(stop_id, self.buffer)
 
     @classmethod
     def new_or_cached(cls, frame: lldb.SBFrame):
-        if cls._instance is None:
-            cls._instance = cls(frame)
-            cls._frame = frame
-        if cls._frame != frame:
-            cls._instance.update_reg_sets(frame)
-        return cls._instance
+        with cls._lock:
+            return cls._new_or_cached(frame)
+
+    @classmethod
+    def _new_or_cached(cls, frame: lldb.SBFrame):
+        if cls._current is not None and cls._render_count == Dashboard.render_count:
+            return cls._current
+
+        thread: lldb.SBThread = frame.GetThread()
+        process: lldb.SBProcess = thread.GetProcess()
+        process_id: int = process.GetUniqueID()
+        stop_id: int = process.GetStopID()
+        key = (process_id, thread.GetThreadID(), frame.GetFrameID())
+
+        # Every thread and frame keeps its own previous snapshot to compare against
+        reader = cls._instances.get(key)
+        if reader is None:
+            layout = RegisterLayout.new_or_cached(frame, process_id)
+            history = None
+            if key[2] == 0:
+                history = cls._histories.get(key[:2])
+                if history is None or history.size != layout.size:
+                    history = cls._histories[key[:2]] = RegisterHistory(cls.history_depth, layout.size)
+            reader = cls._instances[key] = cls(layout, frame, stop_id, history)
+        else:
+            reader.update(frame, stop_id)
+        cls._instances.move_to_end(key)
+        cls.shrink()
+
+        cls._current = reader
+        cls._render_count = Dashboard.render_count
+        return reader
+
+    @classmethod
+    def current(cls):
+        return cls._current
+
+    @classmethod
+    def resize(cls, capacity: int):
+        with cls._lock:
+            cls.capacity = capacity
+            cls.shrink()
+
+    @classmethod
+    def resize_history(cls, depth: int):
+        with cls._lock:
+            cls.history_depth = depth
+            for history in cls._histories.values():
+                history.resize(depth)
+
+    @classmethod
+    def shrink(cls):
+        while len(cls._instances) > max(cls.capacity, 1):
+            cls._instances.popitem(last=False)
+        threads = {key[:2] for key in cls._instances if key[2] == 0}
+        for key in [key for key in cls._histories if key not in threads]:
+            del cls._histories[key]
+
+    def update(self, frame: lldb.SBFrame, stop_id: int):
+        # register write changes registers without a new stop, so every render reads them again while the
+        # previous snapshot and the history only move on to the next stop
+        buffer = self.snapshot(frame)
+        # Decoded x87 values compare against the previous stop, they only go stale when either snapshot changes
+        if stop_id != self.stop_id or buffer != self.buffer:
+            self.x87.clear()
+        if stop_id != self.stop_id:
+            self.stop_id = stop_id
+            self.prev_buffer = self.buffer
+        if self.history is not None:
+            self.history.record(stop_id, buffer)
+        self.buffer = buffer
+
+    def snapshot(self, frame: lldb.SBFrame):
+        reg_sets: list[lldb.SBValue] = list(frame.GetRegisters())
+        buffer = bytearray(self.layout.size)
+        error = lldb.SBError()
+        # A register set value has no data of its own to slice, every register has to be read through its child
+        for i, j, offset, size in self.layout.entries:
+            value: lldb.SBValue = reg_sets[i].GetChildAtIndex(j)
+            data: lldb.SBData = value.GetData()
+            raw: typing.Optional[bytes] = data.ReadRawData(error, 0, size)
+            if raw is not None and error.Success():
+                buffer[offset : offset + len(raw)] = raw
+        return buffer
+
+    def changes(self, delta: int):
+        for name, (offset, size) in self.layout.slots.items():
+            if delta >> (offset * 8) & ((1 << (size * 8)) - 1):
+                yield name, offset, size
 
-    def update_reg_sets(self, frame: lldb.SBFrame):
-        self.frame = frame
-        for reg_set in frame.GetRegisters():
-            name: str = reg_set.GetName().lower()
-            if "general purpose" in name:
-                self.gp_reg_set: lldb.SBValue = reg_set
-            elif "advanced vector extensions" in name:
-                self.avx_reg_set: lldb.SBValue = reg_set
-            elif "floating point" in name:
-                self.fp_reg_set: lldb.SBValue = reg_set
+    def read_uint(self, name: str):
+        offset, size = self.layout.slots[name]
+        prev_value = int.from_bytes(self.prev_buffer[offset : offset + size], "little")
+        return int.from_bytes(self.buffer[offset : offset + size], "little"), prev_value
+
+    def read_value(self, name: str):
+        if name in self.layout.aliases:
+            return self.read_gp(name).value_uint
+        if name in self.layout.slots:
+            return self.read_uint(name)[0]
+        # Zero registers and anything else the snapshot does not hold
+        return 0
 
     def read_gp(self, name: str):
-        entry, pc_changed = self.get_entry(name)
-        values: list[lldb.SBValue] = [self.gp_reg_set.GetChildAtIndex(i) for i in entry.indices]
-        if pc_changed:
-            entry.values[0] = values[0].GetValueAsUnsigned()
-        return GeneralPurposeRegister(values, entry.prev_values[0])
+        alias = self.layout.aliases[name]
+        mask = (1 << alias.width) - 1
+        value, prev_value = self.read_uint(alias.base)
+        return GeneralPurposeRegister(alias.names, value & mask, prev_value & mask, alias.width)
 
     def read_segment(self, name: str):
-        entry, pc_changed = self.get_entry(name)
-        value: lldb.SBValue = self.gp_reg_set.GetChildAtIndex(entry.indices[0])
-        if pc_changed:
-            entry.values[0] = value.GetValueAsUnsigned()
-        return SegmentRegister(value.GetName(), entry.values[0], entry.prev_values[0])
-
-    def read_rflags(self):
-        entry, pc_changed = self.get_entry("rflags")
-        value: lldb.SBValue = self.gp_reg_set.GetChildAtIndex(entry.indices[0])
-        if pc_changed:
-            entry.values[0] = value.GetValueAsUnsigned()
-        return RflagsRegister(value.GetName(), entry.values[0], entry.prev_values[0])
-
-    def read_mxcsr(self):
-        entry, pc_changed = self.get_entry("mxcsr")
-        value: lldb.SBValue = self.fp_reg_set.GetChildAtIndex(entry.indices[0])
-        if pc_changed:
-            entry.values[0] = value.GetValueAsUnsigned()
-        return MxcsrRegister(value.GetName(), entry.values[0], entry.prev_values[0])
-
-    def read_avx(self, name: str):
-        entry, pc_changed = self.get_entry(name)
-        ymm: lldb.SBValue = self.avx_reg_set.GetChildAtIndex(entry.indices[0])
-        xmm: lldb.SBValue = self.fp_reg_set.GetChildAtIndex(entry.indices[1])
-        if pc_changed:
-            entry.values = [child.GetValueAsUnsigned() for child in ymm]
-        return AvxRegister(ymm.GetName(), xmm.GetName(), entry.values, entry.prev_values)
-
-    def get_entry(self, name: str):
-        entry = self.entries[name]
-        pc = self.frame.GetPC()
-        pc_changed = entry.pc != pc
-        entry.pc = pc
-        entry.pc_change_count += pc_changed
-        if entry.pc_change_count == 1:
-            entry.pc_change_count = 0
-            entry.prev_values = entry.values.copy()
-        return entry, pc_changed
+        return SegmentRegister(self.layout.names[name], *self.read_uint(name))
+
+    def read_flags(self, name: str):
+        return FlagRegister(self.layout.names[name], FLAG_FIELDS[name], *self.read_uint(name))
+
+    def read_x87(self, i: int):
+        # Decoded values are kept until the registers change so toggling views does not decode again
+        reg = self.x87.get(i)
+        if reg is None:
+            name = self.layout.x87_names[i]
+            offset, size = self.layout.slots[name]
+            top = self.read_uint("fstat")[0] >> 11 & 7 if "fstat" in self.layout.slots else 0
+            tags = self.read_uint("ftag")[0] if "ftag" in self.layout.slots else 0
+            physical = (top + i) & 7
+            reg = self.x87[i] = X87Register(
+                self.layout.names[name],
+                physical,
+                tags >> (physical * 2) & 3,
+                bytes(self.buffer[offset : offset + size]),
+                bytes(self.prev_buffer[offset : offset + size]),
+            )
+        return reg
+
+    def read_vector(self, name: str, format: VectorFormat = VECTOR_FORMATS["u8"]):
+        offset, size = self.layout.slots[name]
+        raw = bytes(self.buffer[offset : offset + size])
+        prev_raw = bytes(self.prev_buffer[offset : offset + size])
+        return VectorRegister(int(name.lstrip(string.ascii_letters)), raw, prev_raw, format)
+
+    def read_opmask(self, name: str):
+        return OpmaskRegister(self.layout.names[name], *self.read_uint(name))
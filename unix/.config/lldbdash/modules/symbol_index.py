@@ -0,0 +1,87 @@
+import array
+import bisect
+import threading
+import typing
+
+import lldb
+
+CODE_SYMBOL_TYPES = {lldb.eSymbolTypeCode, lldb.eSymbolTypeResolver, lldb.eSymbolTypeTrampoline}
+
+
+def module_key(module: lldb.SBModule) -> str:
+    return module.GetUUIDString() or str(module.GetFileSpec())
+
+
+class SymbolIndex:
+    def __init__(self, module: lldb.SBModule, target: lldb.SBTarget):
+        ranges: list[tuple[int, int, lldb.SBSymbol]] = []
+
+        for i in range(module.GetNumSymbols()):
+            symbol: lldb.SBSymbol = module.GetSymbolAtIndex(i)
+            if symbol.GetType() not in CODE_SYMBOL_TYPES:
+                continue
+            start: int = symbol.GetStartAddress().GetLoadAddress(target)
+            end: int = symbol.GetEndAddress().GetLoadAddress(target)
+            if start == lldb.LLDB_INVALID_ADDRESS or end <= start:
+                continue
+            ranges.append((start, end, symbol))
+
+        ranges.sort(key=lambda r: (r[0], r[1]))
+
+        self.starts = array.array("Q", (r[0] for r in ranges))
+        self.ends = array.array("Q", (r[1] for r in ranges))
+        self.symbols = [r[2] for r in ranges]
+
+    def find(self, addr: int):
+        i = bisect.bisect_right(self.starts, addr) - 1
+        if i < 0 or addr >= self.ends[i]:
+            return None
+        return self.symbols[i]
+
+
+class SymbolIndexes:
+    def __init__(self):
+        self.target: typing.Optional[lldb.SBTarget] = None
+        self.listener = lldb.SBListener("lldbdash.symbol-index")
+        self.event = lldb.SBEvent()
+        self.indexes: dict[str, SymbolIndex] = {}
+        self.lock = threading.Lock()
+
+    def find(self, target: lldb.SBTarget, addr: int) -> typing.Optional[lldb.SBSymbol]:
+        with self.lock:
+            return self._find(target, addr)
+
+    def _find(self, target: lldb.SBTarget, addr: int) -> typing.Optional[lldb.SBSymbol]:
+        self.sync(target)
+
+        module: lldb.SBModule = lldb.SBAddress(addr, target).GetModule()
+
+        if not module.IsValid():
+            context: lldb.SBSymbolContext = target.ResolveSymbolContextForAddress(
+                lldb.SBAddress(addr, target), lldb.eSymbolContextSymbol
+            )
+            symbol: lldb.SBSymbol = context.GetSymbol()
+            return symbol if symbol.IsValid() else None
+
+        key = module_key(module)
+        index = self.indexes.get(key)
+        if index is None:
+            index = self.indexes[key] = SymbolIndex(module, target)
+        return index.find(addr)
+
+    def sync(self, target: lldb.SBTarget):
+        if self.target is None or self.target != target:
+            events = lldb.SBTarget.eBroadcastBitModulesLoaded | lldb.SBTarget.eBroadcastBitModulesUnloaded
+            if self.target is not None:
+                self.listener.StopListeningForEvents(self.target.GetBroadcaster(), events)
+            self.target = target
+            self.indexes.clear()
+            self.listener.StartListeningForEvents(target.GetBroadcaster(), events)
+
+        while self.listener.GetNextEvent(self.event):
+            for i in range(lldb.SBTarget.GetNumModulesFromEvent(self.event)):
+                module: lldb.SBModule = lldb.SBTarget.GetModuleAtIndexFromEvent(i, self.event)
+                self.indexes.pop(module_key(module), None)
+
+
+g_symbol_indexes = SymbolIndexes()
@@ -0,0 +1,155 @@
+import bisect
+import typing
+
+import lldb
+
+from .symbol_index import g_symbol_indexes
+
+READ_SIZE = 64
+# Addresses closer than this to the start of a pending read are fetched by the same read
+COALESCE_SIZE = 512
+MIN_STRING_LENGTH = 4
+MAX_STRING_LENGTH = 48
+
+
+class Region(typing.NamedTuple):
+    start: int
+    end: int
+    readable: bool
+    executable: bool
+
+
+class MemoryMap:
+    def __init__(self, process: lldb.SBProcess):
+        regions: list[Region] = []
+        region_list: lldb.SBMemoryRegionInfoList = process.GetMemoryRegions()
+        info = lldb.SBMemoryRegionInfo()
+        for i in range(region_list.GetSize()):
+            if region_list.GetMemoryRegionAtIndex(i, info) and info.IsMapped():
+                regions.append(
+                    Region(info.GetRegionBase(), info.GetRegionEnd(), info.IsReadable(), info.IsExecutable())
+                )
+        regions.sort()
+        self.regions = regions
+        self.starts = [region.start for region in regions]
+
+    def find(self, addr: int) -> typing.Optional[Region]:
+        i = bisect.bisect_right(self.starts, addr) - 1
+        if i < 0 or addr >= self.regions[i].end:
+            return None
+        return self.regions[i]
+
+
+class Link(typing.NamedTuple):
+    addrs: list[int]
+    text: typing.Optional[str]
+    code: bool
+
+
+class Telescope:
+    _instance: typing.Optional["Telescope"] = None
+    _key = (-1, -1)
+
+    def __init__(self, process: lldb.SBProcess):
+        self.process = process
+        self.target: lldb.SBTarget = process.GetTarget()
+        self.pointer_size: int = self.target.GetAddressByteSize()
+        self.memory_map = MemoryMap(process)
+        self.memory = dict[int, bytes]()
+        self.symbols = dict[int, str]()
+        self.read_bytes = 0
+        self.read_count = 0
+
+    @classmethod
+    def new_or_cached(cls, process: lldb.SBProcess):
+        key = (process.GetUniqueID(), process.GetStopID())
+        if cls._instance is None or cls._key != key:
+            cls._instance = cls(process)
+            cls._key = key
+        return cls._instance
+
+    def fetch(self, addrs: typing.Iterable[int], budget: int):
+        pending = sorted({addr for addr in addrs if addr not in self.memory})
+        i = 0
+        while i < len(pending) and self.read_bytes < budget:
+            start = pending[i]
+            region = typing.cast(Region, self.memory_map.find(start))
+            j = i + 1
+            while j < len(pending) and pending[j] < min(start + COALESCE_SIZE, region.end):
+                j += 1
+
+            end = min(pending[j - 1] + READ_SIZE, region.end, start + budget - self.read_bytes)
+            error = lldb.SBError()
+            data: typing.Optional[bytes] = self.process.ReadMemory(start, end - start, error)
+            self.read_bytes += end - start
+            self.read_count += 1
+            if data is None or not error.Success():
+                data = b""
+
+            for addr in pending[i:j]:
+                self.memory[addr] = data[addr - start : addr - start + READ_SIZE]
+            i = j
+
+    def is_readable(self, addr: int):
+        region = self.memory_map.find(addr)
+        return region is not None and region.readable
+
+    def symbolize(self, addr: int):
+        name = self.symbols.get(addr)
+        if name is None:
+            symbol = g_symbol_indexes.find(self.target, addr)
+            if symbol is not None:
+                offset = addr - symbol.GetStartAddress().GetLoadAddress(self.target)
+                name = f"{symbol.GetName()}+{offset}" if offset else symbol.GetName()
+            else:
+                name = ""
+            self.symbols[addr] = name
+        return name
+
+    def follow(self, values: list[int], depth: int, budget: int) -> list[Link]:
+        chains = [[value] for value in values]
+        texts: list[typing.Optional[str]] = [None] * len(values)
+        code = [False] * len(values)
+        active = [i for i, value in enumerate(values) if self.is_readable(value)]
+
+        # Breadth first, so every level of every chain is fetched together
+        for _ in range(depth):
+            if not active:
+                break
+            self.fetch((chains[i][-1] for i in active if not self.memory_map.find(chains[i][-1]).executable), budget)
+
+            next_active = []
+            for i in active:
+                addr = chains[i][-1]
+                if typing.cast(Region, self.memory_map.find(addr)).executable:
+                    texts[i] = self.symbolize(addr)
+                    code[i] = True
+                    continue
+
+                data = self.memory.get(addr)
+                if not data:
+                    continue
+
+                if (string := as_string(data)) is not None:
+                    texts[i] = repr(string)
+                    continue
+
+                if len(data) < self.pointer_size:
+                    continue
+                pointer = int.from_bytes(data[: self.pointer_size], "little")
+                if self.is_readable(pointer) and pointer not in chains[i]:
+                    chains[i].append(pointer)
+                    next_active.append(i)
+                else:
+                    texts[i] = f"{pointer:#x}"
+            active = next_active
+
+        return [Link(chain[1:], texts[i], code[i]) for i, chain in enumerate(chains)]
+
+
+def as_string(data: bytes):
+    end = data.find(0)
+    text = data[: end if end >= 0 else MAX_STRING_LENGTH]
+    if len(text) < MIN_STRING_LENGTH or not all(32 <= c < 127 or c in (9, 10, 13) for c in text):
+        return None
+    return text[:MAX_STRING_LENGTH].decode()
@@ -0,0 +1,84 @@
+class FakeData:
+    def __init__(self, raw: bytes):
+        self.raw = raw
+
+    def ReadRawData(self, error, offset: int, size: int):
+        return self.raw[offset : offset + size]
+
+
+class FakeRegister:
+    def __init__(self, name: str, value: int, size: int):
+        self.name = name
+        self.value = value
+        self.size = size
+
+    def GetName(self):
+        return self.name
+
+    def GetByteSize(self):
+        return self.size
+
+    def GetData(self):
+        return FakeData(self.value.to_bytes(self.size, "little"))
+
+
+class FakeRegisterSet(list):
+    def GetChildAtIndex(self, i: int):
+        return self[i]
+
+
+class FakeProcess:
+    def __init__(self, triple: str):
+        self.triple = triple
+        self.stop_id = 1
+
+    def GetUniqueID(self):
+        return 1
+
+    def GetStopID(self):
+        return self.stop_id
+
+    def GetTarget(self):
+        return self
+
+    def GetTriple(self):
+        return self.triple
+
+
+class FakeThread:
+    def __init__(self, process: FakeProcess):
+        self.process = process
+
+    def GetProcess(self):
+        return self.process
+
+    def GetThreadID(self):
+        return 1
+
+
+class FakeFrame:
+    def __init__(self, reg_sets: list[list[tuple[str, int, int]]], thread: FakeThread | None = None, frame_id=0):
+        self.reg_sets = reg_sets
+        self.thread = thread
+        self.frame_id = frame_id
+
+    def GetRegisters(self):
+        return [FakeRegisterSet(FakeRegister(*reg) for reg in reg_set) for reg_set in self.reg_sets]
+
+    def GetThread(self):
+        return self.thread
+
+    def GetFrameID(self):
+        return self.frame_id
+
+
+class FakeResult:
+    def __init__(self):
+        self.output = ""
+        self.error = ""
+
+    def Print(self, text: str):
+        self.output += text
+
+    def SetError(self, text: str):
+        self.error = text
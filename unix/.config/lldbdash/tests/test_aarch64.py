@@ -0,0 +1,107 @@
+import pytest
+
+lldb = pytest.importorskip("lldb")
+
+from fakes import FakeFrame  # noqa: E402
+from lldbdash.modules import aarch64_condition_codes as cc  # noqa: E402
+from lldbdash.modules.architecture import AARCH64, BranchPredictor, aarch64_condition_mask  # noqa: E402
+from lldbdash.modules.branch_condition import Condition  # noqa: E402
+from lldbdash.modules.register_history import RegisterHistory  # noqa: E402
+from lldbdash.modules.register_reader import RegisterLayout, RegisterReader  # noqa: E402
+
+
+def aarch64_frame(values: dict[str, int]):
+    gp = [(f"x{i}", values.get(f"x{i}", 0), 8) for i in range(29)]
+    gp += [(name, values.get(name, 0), 8) for name in ("fp", "lr", "sp", "pc")]
+    gp += [("cpsr", values.get("cpsr", 0), 4)]
+    gp += [(f"w{i}", values.get(f"x{i}", 0) & 0xFFFFFFFF, 4) for i in range(29)]
+    fp = [(f"v{i}", 0, 16) for i in range(32)]
+    fp += [(name, values.get(name, 0), 4) for name in ("fpsr", "fpcr")]
+    return FakeFrame([gp, fp])
+
+
+def make_reader(values: dict[str, int]):
+    frame = aarch64_frame(values)
+    layout = RegisterLayout(frame, AARCH64)
+    return RegisterReader(layout, frame, 1, RegisterHistory(1, layout.size))
+
+
+def flags(n=0, z=0, c=0, v=0):
+    return n << 31 | z << 30 | c << 29 | v << 28
+
+
+def test_layout():
+    layout = make_reader({}).layout
+    assert layout.gp_names[:3] == ["x0", "x1", "x2"]
+    assert layout.gp_names[-4:] == ["fp", "lr", "sp", "pc"]
+    assert layout.vector_names == [f"v{i}" for i in range(32)]
+    assert "w0" not in layout.slots
+
+
+def test_read_gp_aliases():
+    reader = make_reader({"x2": 0x1122334455667788})
+    x2 = reader.read_gp("x2")
+    w2 = reader.read_gp("w2")
+    assert x2.value_uint == 0x1122334455667788
+    assert x2.names == ["x2", "w2"]
+    assert w2.value_uint == 0x55667788
+    assert w2.names == ["w2"]
+    assert reader.read_value("w2") == 0x55667788
+    assert reader.read_value("xzr") == 0
+
+
+@pytest.mark.parametrize(
+    "cpsr, taken",
+    [
+        (flags(), {cc.CC_NE, cc.CC_CC, cc.CC_PL, cc.CC_VC, cc.CC_LS, cc.CC_GE, cc.CC_GT}),
+        (flags(z=1, c=1), {cc.CC_EQ, cc.CC_CS, cc.CC_PL, cc.CC_VC, cc.CC_LS, cc.CC_GE, cc.CC_LE}),
+        (flags(n=1), {cc.CC_NE, cc.CC_CC, cc.CC_MI, cc.CC_VC, cc.CC_LS, cc.CC_LT, cc.CC_LE}),
+        (flags(c=1), {cc.CC_NE, cc.CC_CS, cc.CC_PL, cc.CC_VC, cc.CC_HI, cc.CC_GE, cc.CC_GT}),
+        (flags(n=1, v=1), {cc.CC_NE, cc.CC_CC, cc.CC_MI, cc.CC_VS, cc.CC_LS, cc.CC_GE, cc.CC_GT}),
+    ],
+)
+def test_condition_mask(cpsr: int, taken: set[int]):
+    mask = aarch64_condition_mask(make_reader({"cpsr": cpsr}))
+    assert {code for code in range(14) if mask >> code & 1} == taken
+    assert mask >> cc.CC_AL & 1 and mask >> cc.CC_NV & 1
+
+
+@pytest.mark.parametrize(
+    "mnemonic, operands, condition",
+    [
+        ("b.eq", "0x1000", Condition(cc.CC_EQ)),
+        ("b.hs", "0x1000", Condition(cc.CC_CS)),
+        ("bc.gt", "0x1000", Condition(cc.CC_GT)),
+        ("b", "0x1000", None),
+        ("cbz", "x1, 0x1000", Condition(cc.CC_ZERO, "x1")),
+        ("cbnz", "w3, 0x1000", Condition(cc.CC_NONZERO, "w3")),
+        ("tbz", "w2, #3, 0x1000", Condition(cc.CC_BIT_CLEAR, "w2", 3)),
+        ("tbnz", "x4, #0x3f, 0x1000", Condition(cc.CC_BIT_SET, "x4", 63)),
+        ("csel", "x0, x1, x2, ne", Condition(cc.CC_NE)),
+        ("cset", "w0, lo", Condition(cc.CC_CC)),
+        ("add", "x0, x0, #1", None),
+    ],
+)
+def test_resolve_condition(mnemonic: str, operands: str, condition: Condition | None):
+    assert cc.resolve_condition(mnemonic, operands) == condition
+
+
+@pytest.mark.parametrize(
+    "mnemonic, operands, taken",
+    [
+        ("b.eq", "0x1000", True),
+        ("b.gt", "0x1000", False),
+        ("cbz", "x1, 0x1000", True),
+        ("cbnz", "x1, 0x1000", False),
+        ("tbnz", "w2, #3, 0x1000", True),
+        ("tbz", "w2, #3, 0x1000", False),
+        ("tbnz", "x2, #35, 0x1000", False),
+        ("csel", "x0, x1, x2, ne", False),
+        ("cset", "w0, hs", True),
+    ],
+)
+def test_branch_predictor(mnemonic: str, operands: str, taken: bool):
+    predictor = BranchPredictor(AARCH64, make_reader({"cpsr": flags(z=1, c=1), "x1": 0, "x2": 1 << 40 | 8}))
+    condition = AARCH64.resolve_condition(mnemonic, operands)
+    assert condition is not None
+    assert predictor.is_taken(condition) == taken
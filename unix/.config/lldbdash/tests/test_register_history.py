@@ -0,0 +1,78 @@
+import pytest
+
+lldb = pytest.importorskip("lldb")
+
+from fakes import FakeFrame, FakeProcess, FakeResult, FakeThread  # noqa: E402
+from lldbdash.dashboard import Dashboard  # noqa: E402
+from lldbdash.modules.register_module import print_diff, print_history  # noqa: E402
+from lldbdash.modules.register_reader import RegisterLayout, RegisterReader  # noqa: E402
+
+
+def x86_frame(thread: FakeThread, frame_id: int, rax: int, rsp: int):
+    gp = [("rax", rax, 8), ("rbp", rsp + 0x40, 8), ("rsp", rsp, 8), ("rflags", 0x246, 8)]
+    return FakeFrame([gp], thread, frame_id)
+
+
+def render(frame: FakeFrame):
+    Dashboard.render_count += 1
+    return RegisterReader.new_or_cached(frame)
+
+
+@pytest.fixture
+def thread():
+    RegisterLayout._instance = None
+    RegisterReader._instances.clear()
+    RegisterReader._histories.clear()
+    RegisterReader._current = None
+    return FakeThread(FakeProcess("x86_64-pc-linux-gnu"))
+
+
+def test_outer_frame_does_not_overwrite_history(thread: FakeThread):
+    process = thread.GetProcess()
+    render(x86_frame(thread, 0, rax=1, rsp=0x1000))
+    process.stop_id += 1
+    frame0 = render(x86_frame(thread, 0, rax=2, rsp=0x1000))
+    frame1 = render(x86_frame(thread, 1, rax=2, rsp=0x1100))
+
+    assert frame1.history is None
+    result = FakeResult()
+    print_diff([], result)
+    assert result.error == "Register history is only kept for frame 0"
+
+    # The stop's snapshot still holds frame 0 after frame 1 was rendered
+    assert bytes(frame0.history.get(0)[1]) == bytes(frame0.buffer)
+    assert render(x86_frame(thread, 0, rax=2, rsp=0x1000)) is frame0
+
+    result = FakeResult()
+    print_diff([], result)
+    assert result.error == ""
+    assert result.output.splitlines() == ["stop 1 -> stop 2", f"{'rax':>8} {1:016x} -> {2:016x}"]
+
+    result = FakeResult()
+    print_history([], result)
+    assert [line.split()[-1] for line in result.output.splitlines()] == ["rax", "-"]
+
+
+def test_diff_shows_register_writes_within_a_stop(thread: FakeThread):
+    render(x86_frame(thread, 0, rax=1, rsp=0x1000))
+    thread.GetProcess().stop_id += 1
+    render(x86_frame(thread, 0, rax=1, rsp=0x1000))
+    render(x86_frame(thread, 0, rax=7, rsp=0x1000))
+
+    result = FakeResult()
+    print_diff([], result)
+    assert result.output.splitlines()[1:] == [f"{'rax':>8} {1:016x} -> {7:016x}"]
+
+
+def test_x87_decoded_once_per_stop(thread: FakeThread):
+    def frame(st0: int):
+        fpu = [("fstat", 0, 2), ("ftag", 0, 2)] + [(f"st{i}", st0 if i == 0 else 0, 10) for i in range(8)]
+        return FakeFrame([[("rax", 0, 8)], fpu], thread, 0)
+
+    one = 0x3FFF << 64 | 1 << 63
+    reader = render(frame(one))
+    decoded = reader.read_x87(0)
+    assert render(frame(one)).read_x87(0) is decoded
+
+    # A register write within the stop is decoded again
+    assert render(frame(one + 1)).read_x87(0) is not decoded